@@ -0,0 +1,33 @@
+"""
+Shared HTTP plumbing for the agents.
+
+Every agent talks to a small set of hosts over and over, so they all use
+the same recipe: one pooled ``requests.Session`` with keep-alive and a
+retry policy that absorbs transient 429/5xx responses instead of flipping
+releases to FAILED_DL.
+"""
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+
+
+def make_session(ua: str = UA) -> Session:
+    """Return a pooled session with retries mounted for http and https."""
+    s = Session()
+    s.headers["User-Agent"] = ua
+    # ask for compressed bodies – BLS/Eurostat HTML shrinks ~5-10x on the
+    # wire; requests decompresses transparently (brotli dep covers "br")
+    s.headers["Accept-Encoding"] = "gzip, deflate, br"
+    retry = Retry(
+        total=4,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=16)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
@@ -10,15 +10,23 @@ Downloads each release URL to data/raw/{safe_release_id}.html or .pdf.
 Sends a browser User-Agent header so BLS pages aren’t blocked.
 """
 
-import csv
 import time
 import logging
+import logging.handlers
 import datetime as dt
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlparse
 
+import pandas as pd
 import requests
 
+try:
+    from agents._http import make_session
+except ImportError:                       # run directly as a script
+    from _http import make_session
+
 # ── Paths relative to mpp_dashboard root ─────────────────────────
 ROOT      = Path(__file__).resolve().parent.parent
 QUEUE_CSV = ROOT / "data" / "rss_queue.csv"
@@ -28,77 +36,117 @@ LOG_DIR   = ROOT / "logs"
 RAW_DIR.mkdir(parents=True, exist_ok=True)
 LOG_DIR.mkdir(exist_ok=True)
 
-logging.basicConfig(
-    filename=LOG_DIR / f"download_{dt.date.today()}.log",
-    level=logging.INFO,
-    format="%(asctime)s  %(levelname)s  %(message)s",
-)
+# buffer INFO records in memory and hit the disk in batches; errors
+# still flush immediately so a crash leaves the evidence on disk.
+# Own named logger (not root) so this agent's records stay out of the
+# other agents' files when several run in one process.
+_file_handler = logging.FileHandler(LOG_DIR / f"download_{dt.date.today()}.log")
+_file_handler.setFormatter(
+    logging.Formatter("%(asctime)s  %(levelname)s  %(message)s"))
+_mem_handler = logging.handlers.MemoryHandler(
+    capacity=200, flushLevel=logging.ERROR, target=_file_handler)
+log = logging.getLogger(__name__)
+log.addHandler(_mem_handler)
+log.setLevel(logging.INFO)
+log.propagate = False
 
 # ── Helpers ──────────────────────────────────────────────────────
-UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+# One pooled session for the whole run: keep-alive avoids a fresh
+# TCP+TLS handshake per release when several come from the same host.
+SESSION = make_session()
+
+SAFE_RE = re.compile(r'[^A-Za-z0-9._-]')
+# translate table beats the regex for the common all-ASCII release_id
+_SAFE_TABLE = str.maketrans({
+    c: "_" for c in map(chr, range(128))
+    if not (c.isalnum() and c.isascii()) and c not in "._-"
+})
 
 def safe_filename(text: str) -> str:
     """Replace illegal filename chars with underscore."""
-    return re.sub(r'[^A-Za-z0-9._-]', '_', text)
+    if text.isascii():
+        return text.translate(_SAFE_TABLE)
+    return SAFE_RE.sub('_', text)
 
 def file_extension(url: str) -> str:
     """Choose extension based on URL."""
     return ".pdf" if url.lower().endswith(".pdf") else ".html"
 
-# ── Main ─────────────────────────────────────────────────────────
-def main():
-    if not QUEUE_CSV.exists():
-        logging.warning("rss_queue.csv missing – nothing to download.")
-        return
+def download_one(row: dict) -> None:
+    """Fetch one QUEUED row and update its status in place."""
+    url = row["url"]
+    ext = file_extension(url)
 
-    rows = list(csv.DictReader(QUEUE_CSV.open(encoding="utf-8")))
-    dirty = False
+    # create a safe filename from the release_id
+    fname = safe_filename(row["release_id"]) + ext
+    outfile = RAW_DIR / fname
 
-    for row in rows:
-        if row.get("status") != "QUEUED":
-            continue
+    # shorter timeout for Eurostat, longer for others
+    timeout = 15 if "ec.europa.eu" in url else 60
 
-        url = row["url"]
-        ext = file_extension(url)
+    try:
+        with SESSION.get(url,
+                         timeout=timeout,
+                         stream=True,
+                         allow_redirects=True) as resp:
+            if resp.status_code >= 400:
+                raise requests.HTTPError(f"{resp.status_code} {resp.reason}")
 
-        # create a safe filename from the release_id
-        fname = safe_filename(row["release_id"]) + ext
-        outfile = RAW_DIR / fname
+            # stream chunks straight to disk – keeps memory bounded even
+            # for the occasional 10MB+ PDF instead of buffering resp.content
+            with outfile.open("wb") as f:
+                for chunk in resp.iter_content(chunk_size=65536):
+                    f.write(chunk)
+        row["status"] = "DOWNLOADED"
+        row["error"]  = ""
+        log.info("DOWNLOADED  %s", row["release_id"])
+
+    except Exception as e:
+        row["status"] = "FAILED_DL"
+        row["error"]  = str(e)
+        log.error("FAILED_DL   %s  –  %s", row["release_id"], e)
+
+
+def download_host(host_rows: list[dict]) -> None:
+    """Download one host's rows serially, with a polite pause between them."""
+    for row in host_rows:
+        download_one(row)
+        time.sleep(0.5)
 
-        # shorter timeout for Eurostat, longer for others
-        timeout = 15 if "ec.europa.eu" in url else 60
 
-        try:
-            resp = requests.get(url,
-                                timeout=timeout,
-                                headers={"User-Agent": UA},
-                                allow_redirects=True)
-            if resp.status_code >= 400:
-                raise requests.HTTPError(f"{resp.status_code} {resp.reason}")
+# ── Main ─────────────────────────────────────────────────────────
+def main():
+    if not QUEUE_CSV.exists():
+        log.warning("rss_queue.csv missing – nothing to download.")
+        return
 
-            outfile.write_bytes(resp.content)
-            row["status"] = "DOWNLOADED"
-            row["error"]  = ""
-            logging.info("DOWNLOADED  %s", row["release_id"])
+    # pandas reads/writes the queue far faster than csv.DictReader at scale;
+    # keep list-of-dict rows so the worker threads can mutate them in place
+    queue_df = pd.read_csv(QUEUE_CSV, dtype=str, keep_default_na=False)
+    rows = queue_df.to_dict("records")
 
-        except Exception as e:
-            row["status"] = "FAILED_DL"
-            row["error"]  = str(e)
-            logging.error("FAILED_DL   %s  –  %s", row["release_id"], e)
+    # group queued rows by host: hosts run in parallel, each host stays
+    # serial so the 0.5 s polite pause still applies per server
+    by_host: dict[str, list[dict]] = {}
+    for row in rows:
+        if row.get("status") == "QUEUED":
+            by_host.setdefault(urlparse(row.get("url", "")).netloc, []).append(row)
 
-        # polite pause
-        time.sleep(0.5)
-        dirty = True
+    dirty = bool(by_host)
+    if by_host:
+        with ThreadPoolExecutor(max_workers=min(8, len(by_host))) as ex:
+            for fut in [ex.submit(download_host, host_rows)
+                        for host_rows in by_host.values()]:
+                fut.result()
 
     if dirty:
-        # write back updated statuses
-        with open(QUEUE_CSV, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=rows[0].keys())
-            w.writeheader()
-            w.writerows(rows)
-        logging.info("rss_queue.csv updated.")
-
-    logging.info("Download agent finished.")
+        # render the CSV in memory and land it with a single write call
+        csv_text = pd.DataFrame(rows, columns=queue_df.columns).to_csv(index=False)
+        QUEUE_CSV.write_text(csv_text, encoding="utf-8", newline="")
+        log.info("rss_queue.csv updated.")
+
+    log.info("Download agent finished.")
+    _mem_handler.flush()
 
 
 if __name__ == "__main__":
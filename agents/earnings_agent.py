@@ -12,9 +12,10 @@ releases/
 """
 
 from __future__ import annotations
-import csv, datetime as dt, re, sys
+import csv, datetime as dt, json, re, sys
 from pathlib import Path
-from bs4 import BeautifulSoup
+
+from lxml import etree, html as lxml_html
 
 # ── CONSTANT LOCATIONS ──────────────────────────────────────────────────
 ROOT      = Path(__file__).resolve().parent.parent
@@ -25,18 +26,49 @@ LOG       = lambda *a, **k: print(*a, file=sys.stderr, **k)
 
 # ── REGEXES ─────────────────────────────────────────────────────────────
 YEAR_SLUG = re.compile(r"-(19|20)\d{2}-")          # for ticker extraction
-TICK_PAT  = re.compile(r"^[A-Z]{1,5}(?:\.[A-Z])?$")
-MONTHS    = {"JAN","FEB","MAR","APR","MAY","JUN","JUL","AUG",
-             "SEP","SEPT","OCT","NOV","DEC","DECEMBER"}
+# one findall over the uppercased slug replaces the per-token match loop
+TICK_FINDALL = re.compile(r"(?:^|-)([A-Z]{1,5}(?:\.[A-Z])?)(?=-|$)")
+MONTHS    = frozenset({"JAN","FEB","MAR","APR","MAY","JUN","JUL","AUG",
+                       "SEP","SEPT","OCT","NOV","DEC","DECEMBER"})
 
 # earnings day inside slug: …-june-20-2025-…
 SLUG_DATE_RE = re.compile(
     r"-(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*-(\d{1,2})-(\d{4})",
-    re.I,
+    re.I | re.ASCII,
 )
 
+DATE_CACHE = ROOT / "data" / "earn_dates.json"
+
+
+def load_date_cache() -> dict[str, str]:
+    if DATE_CACHE.exists():
+        try:
+            return json.loads(DATE_CACHE.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+    return {}
+
+
+def save_date_cache(cache: dict[str, str]) -> None:
+    DATE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    DATE_CACHE.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+
+SAFE_RE = re.compile(r"[^A-Za-z0-9._-]")
+# translate table beats the regex for the common all-ASCII release_id
+_SAFE_TABLE = str.maketrans({
+    c: "_" for c in map(chr, range(128))
+    if not (c.isalnum() and c.isascii()) and c not in "._-"
+})
+
+
+def safe_filename(text: str) -> str:
+    """Replace illegal filename chars with underscore (as download_agent does)."""
+    if text.isascii():
+        return text.translate(_SAFE_TABLE)
+    return SAFE_RE.sub("_", text)
+
 # ── HELPERS ─────────────────────────────────────────────────────────────
-def newest_by_tag(rows: list[dict]) -> dict[str, dict]:
+def newest_by_tag(rows: list[dict], cache: dict[str, str] | None = None) -> dict[str, dict]:
     """
     Pick the latest EARN_PRE / EARN_AH row.
 
@@ -45,31 +77,42 @@ def newest_by_tag(rows: list[dict]) -> dict[str, dict]:
         2. ISO published (YYYY-MM-DD or YYYY-MM-DDTHH:MM…)
         3. DD-MM-YYYY published
         4. date.min if all else fails
+
+    Rows mostly re-appear across runs, so an optional url→date cache
+    (persisted by main) skips the regex/strptime work after first sight.
     """
     latest: dict[str, dict] = {}
+    if cache is None:
+        cache = {}
 
     for r in rows:
         tag = r["dataset"]            # EARN_PRE or EARN_AH
 
-        # 1. try slug → earnings day
         d: dt.date
-        m = SLUG_DATE_RE.search(r["url"])
-        if m:
-            mon_txt, day_txt, year_txt = m.groups()
-            mon_num = dt.datetime.strptime(mon_txt[:3], "%b").month
-            d = dt.date(int(year_txt), mon_num, int(day_txt))
+        cached = cache.get(r["url"])
+        if cached:
+            d = dt.date.fromisoformat(cached)
         else:
-            pub = r.get("published", "").strip()
-
-            # 2. ISO yyyy-mm-dd (optionally with time)
-            try:
-                d = dt.datetime.fromisoformat(pub[:10]).date()
-            except ValueError:
-                # 3. DD-MM-YYYY
+            # 1. try slug → earnings day
+            m = SLUG_DATE_RE.search(r["url"])
+            if m:
+                mon_txt, day_txt, year_txt = m.groups()
+                mon_num = dt.datetime.strptime(mon_txt[:3], "%b").month
+                d = dt.date(int(year_txt), mon_num, int(day_txt))
+            else:
+                pub = r.get("published", "").strip()
+
+                # 2. ISO yyyy-mm-dd (optionally with time)
                 try:
-                    d = dt.datetime.strptime(pub, "%d-%m-%Y").date()
+                    d = dt.datetime.fromisoformat(pub[:10]).date()
                 except ValueError:
-                    d = dt.date.min          # 4. fallback
+                    # 3. DD-MM-YYYY
+                    try:
+                        d = dt.datetime.strptime(pub, "%d-%m-%Y").date()
+                    except ValueError:
+                        d = dt.date.min          # 4. fallback
+            if d != dt.date.min:          # don't pin the fallback
+                cache[r["url"]] = d.isoformat()
 
         if tag not in latest or d > latest[tag]["_ts"]:
             r["_ts"] = d
@@ -78,12 +121,27 @@ def newest_by_tag(rows: list[dict]) -> dict[str, dict]:
     return latest
 
 
+BLANKLINES_RE = re.compile(r"\n{3,}")
+
+
 def html_to_text(html: str) -> str:
-    soup = BeautifulSoup(html, "lxml")
-    for t in soup(["script", "style", "noscript", "header", "footer", "nav"]):
-        t.decompose()
-    text = soup.get_text("\n", strip=True)
-    return re.sub(r"\n{3,}", "\n\n", text).strip()
+    # lxml does the boilerplate strip and text walk in C – much cheaper
+    # than decomposing nodes one by one through a BeautifulSoup tree
+    if not html.strip():
+        return ""
+    try:
+        # bytes input: lxml rejects str documents that carry an XML
+        # encoding declaration
+        doc = lxml_html.fromstring(html.encode("utf-8"))
+    except etree.ParserError:     # e.g. comment-only document
+        return ""
+    etree.strip_elements(doc, "script", "style", "noscript",
+                         "header", "footer", "nav", with_tail=False)
+    text = "\n".join(
+        line for line in (ln.strip() for ln in doc.text_content().splitlines())
+        if line
+    )
+    return BLANKLINES_RE.sub("\n\n", text).strip()
 
 
 def extract_tickers(url: str) -> list[str]:
@@ -91,15 +149,8 @@ def extract_tickers(url: str) -> list[str]:
     m = YEAR_SLUG.search(url.lower())
     if not m:
         return []
-    slug = url[m.end():].split("?", 1)[0]
-    tickers: list[str] = []
-    for tok in slug.split("-"):
-        up = tok.upper()
-        if up in MONTHS:
-            continue
-        if TICK_PAT.match(up):
-            tickers.append(up)
-    return tickers
+    slug = url[m.end():].split("?", 1)[0].upper()
+    return [t for t in TICK_FINDALL.findall(slug) if t not in MONTHS]
 
 
 def sidecar_path(txt: Path) -> Path:
@@ -124,7 +175,15 @@ def main() -> None:
         LOG("No downloaded Nasdaq earnings rows.")
         return
 
-    for tag, r in newest_by_tag(rows).items():
+    # snapshot RAW_DIR once – O(1) lookups instead of a glob per tag
+    raw_index = {p.stem: p for p in RAW_DIR.iterdir() if p.suffix == ".html"} \
+        if RAW_DIR.exists() else {}
+
+    date_cache = load_date_cache()
+    latest = newest_by_tag(rows, date_cache)
+    save_date_cache(date_cache)
+
+    for tag, r in latest.items():
         ind_dir = f"Nasdaq_{tag}"
         rel_dir = REL_DIR / ind_dir
         rel_dir.mkdir(parents=True, exist_ok=True)
@@ -133,8 +192,9 @@ def main() -> None:
         txt_path = rel_dir / f"{ind_dir}_{stamp}.txt"
 
         # locate raw HTML
-        safe = re.sub(r"[^A-Za-z0-9._-]", "_", r["release_id"])
-        raw  = next((p for p in RAW_DIR.glob(f"{safe}*.html")), None)
+        safe = safe_filename(r["release_id"])
+        raw  = raw_index.get(safe) or next(
+            (p for k, p in raw_index.items() if k.startswith(safe)), None)
         if not raw:
             LOG(f"[WARN] raw HTML for {tag} not found → {r['url']}")
             continue
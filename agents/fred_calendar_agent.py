@@ -8,14 +8,20 @@ Run this once a day via cron / Task Scheduler or just manually:
 """
 
 from __future__ import annotations
-import json
 import os
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
+import orjson
 import requests
 from dotenv import load_dotenv
 
+try:
+    from agents._http import make_session
+except ImportError:                       # run directly as a script
+    from _http import make_session
+
 # ── PATHS ────────────────────────────────────────────────────────────────
 ROOT = pathlib.Path(__file__).resolve().parent.parent   # …/mpp_dashboard
 OUT_PATH = ROOT / "data" / "fred_calendar.json"
@@ -24,8 +30,6 @@ OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 # ── ENV / API KEY ────────────────────────────────────────────────────────
 load_dotenv()
 FRED_API_KEY = os.getenv("FRED_API_KEY")
-if not FRED_API_KEY:
-    raise SystemExit("FRED_API_KEY not found in your environment (.env)")
 
 # ── WHICH RELEASES TO TRACK?  (edit as you like) ─────────────────────────
 # See https://fred.stlouisfed.org/docs/api/fred/releases.html for IDs.
@@ -47,9 +51,13 @@ RELEASES: dict[int, str] = {
 # ── HELPERS ──────────────────────────────────────────────────────────────
 BASE = "https://api.stlouisfed.org/fred"
 
+# All requests hit api.stlouisfed.org, so a pooled session lets the
+# parallel fetches below share keep-alive connections.
+SESSION = make_session()
+
 def get_release_dates(rid: int) -> list[str]:
     """Return YYYY-MM-DD strings of upcoming dates for one release ID."""
-    resp = requests.get(
+    resp = SESSION.get(
         f"{BASE}/release/dates",
         params={
             "api_key": FRED_API_KEY,
@@ -67,30 +75,42 @@ def get_release_dates(rid: int) -> list[str]:
     return [d["date"] for d in resp.json()["release_dates"]]
 
 # ── BUILD UPCOMING EVENTS LIST ───────────────────────────────────────────
-today = datetime.now(timezone.utc).date()
-horizon = today + timedelta(days=28)      # 4-week look-ahead
-
-events: list[dict] = []
-for rid, title in RELEASES.items():
-    for date_str in get_release_dates(rid):
-        d = datetime.strptime(date_str, "%Y-%m-%d").date()
-        if today <= d <= horizon:
-            # Most US macro releases drop at 08:30 ET; others vary.
-            # We stick with 08:30 ET (13:30 UTC) unless you specify otherwise.
-            dt_utc = datetime(d.year, d.month, d.day, 13, 30, tzinfo=timezone.utc)
-            events.append(
-                {
-                    "release_id": rid,
-                    "title": title,
-                    "dt_utc": dt_utc.isoformat(),
-                    "url": f"https://fred.stlouisfed.org/release?rid={rid}",
-                }
-            )
-
-events.sort(key=lambda e: e["dt_utc"])
-
-# ── WRITE JSON ───────────────────────────────────────────────────────────
-with OUT_PATH.open("w", encoding="utf-8") as f:
-    json.dump(events, f, indent=2)
-
-print(f"✅  Wrote {len(events)} events to {OUT_PATH.relative_to(ROOT)}")
+def main() -> None:
+    if not FRED_API_KEY:
+        raise SystemExit("FRED_API_KEY not found in your environment (.env)")
+
+    today = datetime.now(timezone.utc).date()
+    horizon = today + timedelta(days=28)      # 4-week look-ahead
+
+    # fetch all release IDs concurrently; merging stays single-threaded below
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        dates_by_rid = dict(zip(RELEASES, ex.map(get_release_dates, RELEASES)))
+
+    events: list[dict] = []
+    for rid, title in RELEASES.items():
+        for date_str in dates_by_rid[rid]:
+            d = datetime.strptime(date_str, "%Y-%m-%d").date()
+            if today <= d <= horizon:
+                # Most US macro releases drop at 08:30 ET; others vary.
+                # We stick with 08:30 ET (13:30 UTC) unless you specify otherwise.
+                dt_utc = datetime(d.year, d.month, d.day, 13, 30, tzinfo=timezone.utc)
+                events.append(
+                    {
+                        "release_id": rid,
+                        "title": title,
+                        "dt_utc": dt_utc.isoformat(),
+                        "url": f"https://fred.stlouisfed.org/release?rid={rid}",
+                    }
+                )
+
+    events.sort(key=lambda e: e["dt_utc"])
+
+    # ── WRITE JSON ───────────────────────────────────────────────────────
+    # orjson serializes in C and lands the file in one write
+    OUT_PATH.write_bytes(orjson.dumps(events, option=orjson.OPT_INDENT_2))
+
+    print(f"✅  Wrote {len(events)} events to {OUT_PATH.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
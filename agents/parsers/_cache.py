@@ -0,0 +1,49 @@
+"""
+Content-hash short-circuit for the release parsers.
+
+Pipeline runs re-parse every DOWNLOADED release even when the raw HTML
+has not changed. Each parser's ``parse`` is wrapped so the file's
+blake2b digest is checked against data/parse_cache.json first; on a hit
+the stored rows are returned without touching the HTML again.
+"""
+
+import hashlib
+import json
+from functools import wraps
+from pathlib import Path
+
+CACHE_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "parse_cache.json"
+
+
+def _load() -> dict:
+    if CACHE_PATH.exists():
+        try:
+            return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+    return {}
+
+
+def _save(cache: dict) -> None:
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CACHE_PATH.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+
+
+def cached(parse_fn):
+    """Wrap a parser's parse(html_path) with a content-hash cache."""
+
+    @wraps(parse_fn)
+    def wrapper(html_path):
+        digest = hashlib.blake2b(Path(html_path).read_bytes(),
+                                 digest_size=16).hexdigest()
+        cache = _load()
+        entry = cache.get(str(html_path))
+        if entry and entry.get("hash") == digest:
+            return entry["rows"]
+
+        rows = parse_fn(html_path)
+        cache[str(html_path)] = {"hash": digest, "rows": rows}
+        _save(cache)
+        return rows
+
+    return wrapper
@@ -5,24 +5,38 @@ extracts: headline YoY (CPI_U_ALL_ITEMS, percent)
 Works with pages like https://www.bls.gov/news.release/cpi.nr0.htm
 """
 
-import re, requests
-from pathlib import Path
-from bs4 import BeautifulSoup
-
-PERCENT_RE = re.compile(r"([0-9]+\.[0-9])\s*percent")
-
+import mmap
+import re
+
+try:
+    from agents.parsers._cache import cached
+except ImportError:                       # imported outside the package
+    from _cache import cached
+
+# bytes patterns over an mmap'd file: no full-page UTF-8 decode just to
+# pull two 80-char sentences out of a megabyte release
+TAG_RE = re.compile(rb"<[^>]+>")
+YOY_RE = re.compile(rb"over the last 12 months[^.]*?([0-9]+\.[0-9])\s*percent", re.I)
+MOM_RE = re.compile(rb"seasonally adjusted[^.]*?([0-9]+\.[0-9])\s*percent", re.I)
+
+def _read_html(html_path) -> bytes:
+    with open(html_path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return TAG_RE.sub(b" ", mm)
+        except ValueError:              # empty file
+            return b""
+
+@cached
 def parse(html_path):
-    html = Path(html_path).read_text(encoding="utf-8", errors="ignore")
-    soup = BeautifulSoup(html, "lxml")
-
-    text = soup.get_text(" ", strip=True)
+    text = _read_html(html_path)
 
     # YoY headline: sentence ends with "over the last 12 months...X.X percent"
-    yoy_match = re.search(r"over the last 12 months[^.]*?([0-9]+\.[0-9])\s*percent", text, re.I)
+    yoy_match = YOY_RE.search(text)
     yoy = float(yoy_match.group(1)) if yoy_match else None
 
     # MoM headline: sentence with "seasonally adjusted CPI ... X.X percent"
-    mom_match = re.search(r"seasonally adjusted[^.]*?([0-9]+\.[0-9])\s*percent", text, re.I)
+    mom_match = MOM_RE.search(text)
     mom = float(mom_match.group(1)) if mom_match else None
 
     if yoy is None and mom is None:
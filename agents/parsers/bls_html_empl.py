@@ -5,22 +5,38 @@ Extracts:
     NFP_CHANGE – change in nonfarm payrolls, thousands
 """
 
+import mmap
 import re
-from bs4 import BeautifulSoup
-from pathlib import Path
 
+try:
+    from agents.parsers._cache import cached
+except ImportError:                       # imported outside the package
+    from _cache import cached
+
+# bytes patterns over an mmap'd file – skips the full-page UTF-8 decode
+TAG_RE = re.compile(rb"<[^>]+>")
+UNRATE_RE = re.compile(rb"unemployment rate (?:was|is) ([0-9]+\.[0-9]) percent", re.I)
+NFP_RE = re.compile(rb"nonfarm payroll employment.*?([0-9,]+)\s+in", re.I)
+
+def _read_html(html_path) -> bytes:
+    with open(html_path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return TAG_RE.sub(b" ", mm)
+        except ValueError:              # empty file
+            return b""
+
+@cached
 def parse(html_path):
-    html = Path(html_path).read_text(encoding="utf-8", errors="ignore")
-    soup = BeautifulSoup(html, "lxml")
-    text = soup.get_text(" ", strip=True)
+    text = _read_html(html_path)
 
     # Unemployment rate sentence
-    u_match = re.search(r"unemployment rate (?:was|is) ([0-9]+\.[0-9]) percent", text, re.I)
+    u_match = UNRATE_RE.search(text)
     unrate = float(u_match.group(1)) if u_match else None
 
     # Non-farm payroll change e.g. "increased by 175,000"
-    nfp_match = re.search(r"nonfarm payroll employment.*?([0-9,]+)\s+in", text, re.I)
-    nfp = int(nfp_match.group(1).replace(",", "")) if nfp_match else None
+    nfp_match = NFP_RE.search(text)
+    nfp = int(nfp_match.group(1).replace(b",", b"")) if nfp_match else None
 
     if unrate is None and nfp is None:
         raise ValueError("Employment Situation headline not found")
@@ -3,24 +3,39 @@ BLS PPI release parser (HTML)
 Grabs Final-Demand YoY % and MoM % from news.release/ppi.nr0.htm
 """
 
+import mmap
 import re
-from bs4 import BeautifulSoup
-from pathlib import Path
 
-def parse(html_path):
-    html = Path(html_path).read_text(encoding="utf-8", errors="ignore")
-    soup = BeautifulSoup(html, "lxml")
+try:
+    from agents.parsers._cache import cached
+except ImportError:                       # imported outside the package
+    from _cache import cached
+
+# bytes patterns over an mmap'd file – skips the full-page UTF-8 decode
+TAG_RE = re.compile(rb"<[^>]+>")
+YOY_RE = re.compile(rb"final demand.*?([0-9]+\.[0-9])\s*percent.*?12 months", re.I)
+MOM_RE = re.compile(rb"final demand.*?([0-9]+\.[0-9])\s*percent[^.]*?April", re.I)
 
-    text = soup.get_text(" ", strip=True)
+def _read_html(html_path) -> bytes:
+    with open(html_path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return TAG_RE.sub(b" ", mm)
+        except ValueError:              # empty file
+            return b""
+
+@cached
+def parse(html_path):
+    text = _read_html(html_path)
 
     # Example: "The Producer Price Index for final demand increased 2.2 percent
     # for the 12 months ended April ..."
     yoy = None; mom = None
-    yoy_m = re.search(r"final demand.*?([0-9]+\.[0-9])\s*percent.*?12 months", text, re.I)
+    yoy_m = YOY_RE.search(text)
     if yoy_m: yoy = float(yoy_m.group(1))
 
     # Example: "... increased 0.5 percent in April ..."
-    mom_m = re.search(r"final demand.*?([0-9]+\.[0-9])\s*percent[^.]*?April", text, re.I)
+    mom_m = MOM_RE.search(text)
     if mom_m: mom = float(mom_m.group(1))
 
     if yoy is None and mom is None:
@@ -4,20 +4,30 @@ Looks for the first number followed by % or points inside the
 <span class="eurostat-indicator-value"> tag (common pattern).
 """
 
-import re, requests
-from bs4 import BeautifulSoup
+import re
 from pathlib import Path
 
+from lxml import html as lxml_html
+
+try:
+    from agents.parsers._cache import cached
+except ImportError:                       # imported outside the package
+    from _cache import cached
+
+NUMBER_RE = re.compile(r"([-+]?[0-9]+(?:\.[0-9]+)?)")
+
+@cached
 def parse(html_path):
     html = Path(html_path).read_text(encoding="utf-8", errors="ignore")
-    soup = BeautifulSoup(html, "lxml")
+    doc = lxml_html.fromstring(html)
 
-    val_tag = soup.select_one(".eurostat-indicator-value")
-    if not val_tag:
+    # lxml XPath beats bs4 select_one here – we only need one node's text
+    hits = doc.xpath(".//*[contains(@class,'eurostat-indicator-value')]")
+    if not hits:
         raise ValueError("Indicator value tag not found – layout changed?")
-    txt = val_tag.get_text(" ", strip=True)
+    txt = " ".join(hits[0].text_content().split())
 
-    number_m = re.search(r"([-+]?[0-9]+(?:\.[0-9]+)?)", txt)
+    number_m = NUMBER_RE.search(txt)
     if not number_m:
         raise ValueError("Numeric value not found in indicator tag")
     value = float(number_m.group(1))
@@ -3,12 +3,17 @@
 rss_agent.py – pull RSS/Atom feeds, queue press-releases for download
 """
 
-import csv, logging, datetime as dt, time
+import json, logging, datetime as dt, pickle, time
 from pathlib import Path
-import re, requests
+import re
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-import feedparser, pandas as pd
+import feedparser, numpy as np, pandas as pd
+
+try:
+    from agents._http import make_session
+except ImportError:                       # run directly as a script
+    from _http import make_session
 
 # ── Paths ──────────────────────────────────────────────────────────────
 ROOT        = Path(__file__).resolve().parent.parent
@@ -16,11 +21,15 @@ CONFIG_FILE = ROOT / "config" / "feeds_config.xlsx"
 QUEUE_CSV   = ROOT / "data"   / "rss_queue.csv"
 LOG_DIR     = ROOT / "logs"; LOG_DIR.mkdir(exist_ok=True)
 
-logging.basicConfig(
-    filename=LOG_DIR / f"rss_{dt.date.today():%Y-%m-%d}.log",
-    level=logging.INFO,
-    format="%(asctime)s  %(levelname)s  %(message)s",
-)
+# own named logger (not basicConfig on root) so this agent's records
+# stay in its own file when several agents run in one process
+_handler = logging.FileHandler(LOG_DIR / f"rss_{dt.date.today():%Y-%m-%d}.log")
+_handler.setFormatter(
+    logging.Formatter("%(asctime)s  %(levelname)s  %(message)s"))
+log = logging.getLogger(__name__)
+log.addHandler(_handler)
+log.setLevel(logging.INFO)
+log.propagate = False
 
 # ── Default feed list (only first run) ─────────────────────────────────
 DEFAULT_FEEDS = [
@@ -32,39 +41,67 @@ DEFAULT_FEEDS = [
      "eurostat_html_generic",True),
 ]
 
-UA = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+# shared session: the three BLS feeds live on one host, so keep-alive
+# saves a TLS handshake per feed, and retries absorb transient 5xx
+SESSION = make_session()
+
+ETAG_CACHE = ROOT / "data" / "etag_cache.json"
+
+
+def load_etag_cache() -> dict[str, str]:
+    if ETAG_CACHE.exists():
+        try:
+            return json.loads(ETAG_CACHE.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+    return {}
+
+
+def save_etag_cache(cache: dict[str, str]) -> None:
+    ETAG_CACHE.parent.mkdir(exist_ok=True)
+    ETAG_CACHE.write_text(json.dumps(cache, indent=2), encoding="utf-8")
 
 # ── Helpers ────────────────────────────────────────────────────────────
 def bootstrap_config() -> pd.DataFrame:
     if CONFIG_FILE.exists():
-        return pd.read_excel(CONFIG_FILE)
+        # openpyxl takes hundreds of ms even for this tiny sheet, so keep a
+        # pickled copy next to the xlsx and reuse it until the xlsx changes
+        cache = CONFIG_FILE.with_suffix(".pkl")
+        if cache.exists() and cache.stat().st_mtime >= CONFIG_FILE.stat().st_mtime:
+            try:
+                return pickle.loads(cache.read_bytes())
+            except Exception:
+                log.warning("Stale/corrupt config cache – re-reading xlsx")
+        df = pd.read_excel(CONFIG_FILE)
+        cache.write_bytes(pickle.dumps(df))
+        return df
 
     CONFIG_FILE.parent.mkdir(exist_ok=True)
     df = pd.DataFrame(
         DEFAULT_FEEDS, columns=["source","dataset","url","parser","active"]
     )
     df.to_excel(CONFIG_FILE, index=False)
-    logging.warning("Created default feeds_config.xlsx")
+    log.warning("Created default feeds_config.xlsx")
     return df
 
-def load_existing_queue() -> list[dict]:
+def load_existing_queue() -> tuple[list[dict], set[str]]:
+    """Return (rows, release-id set) from the queue in one read."""
     if not QUEUE_CSV.exists():
-        return []
-    with QUEUE_CSV.open(newline='', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+        return [], set()
+    # pandas parses the queue in C instead of allocating a dict per row;
+    # the dedup set is built straight from the column, not row dicts
+    df = pd.read_csv(QUEUE_CSV, dtype=str, keep_default_na=False)
+    return df.to_dict("records"), set(df["release_id"].tolist())
+
 def sort_key(r):
+    # DD-MM-YYYY → 20250619   or   YYYY-MM-DD → 20250619
+    # slice-only fast path: no split/branch-per-part, "" for anything else
     pub = r["published"]
-    try:
-        # DD-MM-YYYY → 20250619   or   YYYY-MM-DD → 20250619
-        if "-" in pub:
-            parts = pub.split("-")
-            if len(parts[0]) == 4:               # ISO
-                y, m, d = parts
-            else:                                # DD-MM-YYYY
-                d, m, y = parts
-            return f"{y}{m}{d}"
-    except Exception:
-        pass
+    if len(pub) >= 10:
+        if pub[4] == "-":                        # ISO
+            return pub[:4] + pub[5:7] + pub[8:10]
+        if pub[2] == "-":                        # DD-MM-YYYY
+            return pub[6:10] + pub[3:5] + pub[0:2]
     return ""                                    # fallback
 
 def write_queue(all_rows:list[dict]) -> None:
@@ -73,31 +110,34 @@ def write_queue(all_rows:list[dict]) -> None:
     for r in all_rows:
         for c in cols:
             r.setdefault(c,"")
-    all_rows.sort(key=sort_key, reverse=True)
+    # compute every key once and argsort the C array instead of calling
+    # sort_key per comparison through list.sort
+    keys = np.fromiter((sort_key(r) for r in all_rows), dtype="U8", count=len(all_rows))
+    # lexsort + reverse = descending by key, ties kept in original order
+    order = np.lexsort((-np.arange(len(all_rows)), keys))[::-1]
+    all_rows = [all_rows[i] for i in order]
     QUEUE_CSV.parent.mkdir(exist_ok=True)
-    with QUEUE_CSV.open("w", newline='', encoding="utf-8") as f:
-        w=csv.DictWriter(f, fieldnames=cols, quoting=csv.QUOTE_MINIMAL)
-        w.writeheader(); w.writerows(all_rows)
+    pd.DataFrame(all_rows, columns=cols).to_csv(QUEUE_CSV, index=False)
 
 # ── Main ───────────────────────────────────────────────────────────────
 def main()->None:
     cfg      = bootstrap_config()
     active   = cfg[cfg["active"].astype(str).str.upper()=="TRUE"]
 
-    existing = load_existing_queue()
-    seen_ids = {r["release_id"] for r in existing}
+    existing, seen_ids = load_existing_queue()
     new_rows = []
+    etag_cache = load_etag_cache()
 
     for _, row in active.iterrows():
         # ── Generic crawler: parser starts with "crawler:" ───────────────
         parser_spec = str(row.get("parser",""))
         if parser_spec.startswith("crawler:"):
             pattern = parser_spec.split(":",1)[1]
-            logging.info("Crawler row – source=%s dataset=%s pattern=%s",
+            log.info("Crawler row – source=%s dataset=%s pattern=%s",
                          row["source"], row["dataset"], pattern)
             try:
-                resp = requests.get(row["url"], headers=UA, timeout=15)
-                logging.info("Fetcher HTTP %s for %s", resp.status_code, row["url"])
+                resp = SESSION.get(row["url"], timeout=15)
+                log.info("Fetcher HTTP %s for %s", resp.status_code, row["url"])
                 resp.raise_for_status()
                 soup = BeautifulSoup(resp.text,"lxml")
 
@@ -122,13 +162,13 @@ def main()->None:
                 link_tag = soup.find("a", href=regex) or soup.find(
                     "a", href=lambda h: h and regex.search(h)
                 )
-                logging.info("Matched tags: %d", 1 if link_tag else 0)
+                log.info("Matched tags: %d", 1 if link_tag else 0)
                 if not link_tag:
-                    logging.warning("Crawler: no href matched for %s", row["dataset"])
+                    log.warning("Crawler: no href matched for %s", row["dataset"])
                     continue
 
                 rel_url = urljoin(row["url"], link_tag["href"])
-                logging.info("Selected release URL: %s", rel_url)
+                log.info("Selected release URL: %s", rel_url)
 
                 # fallback if “Last updated” missing
                 if not published:
@@ -139,7 +179,7 @@ def main()->None:
 
                 rel_id = f"{row['source']}_{row['dataset']}_{rel_url}"
                 if rel_id in seen_ids:
-                    logging.info("Already queued: %s", rel_id)
+                    log.info("Already queued: %s", rel_id)
                     continue
 
                 new_rows.append(
@@ -149,16 +189,33 @@ def main()->None:
                          status="QUEUED", error="")
                 )
                 seen_ids.add(rel_id)
-                logging.info("Crawler queued %s", rel_id)
+                log.info("Crawler queued %s", rel_id)
 
             except Exception as e:
-                logging.error("Crawler error for %s: %s", row["dataset"], e)
+                log.error("Crawler error for %s: %s", row["dataset"], e)
             continue  # skip RSS logic for this row
         # ────────────────────────────────────────────────────────────────
 
-        fp = feedparser.parse(row["url"], request_headers=UA)
+        # fetch through the shared session (keep-alive + conditional GET),
+        # then hand the bytes to feedparser
+        try:
+            hdrs = {}
+            if etag_cache.get(row["url"]):
+                hdrs["If-None-Match"] = etag_cache[row["url"]]
+            resp = SESSION.get(row["url"], headers=hdrs, timeout=15)
+            if resp.status_code == 304:
+                log.info("Feed unchanged (304): %s", row["url"])
+                continue
+            resp.raise_for_status()
+            if resp.headers.get("ETag"):
+                etag_cache[row["url"]] = resp.headers["ETag"]
+        except Exception as e:
+            log.error("Feed fetch failed for %s: %s", row["url"], e)
+            continue
+
+        fp = feedparser.parse(resp.content)
         if not fp.entries:
-            logging.warning("No entries parsed from %s", row["url"]); continue
+            log.warning("No entries parsed from %s", row["url"]); continue
 
         for ent in fp.entries:
             title_lower = (ent.get("title") or "").lower()
@@ -194,12 +251,14 @@ def main()->None:
             )
             seen_ids.add(rel_id)
 
+    save_etag_cache(etag_cache)
+
     if new_rows:
         write_queue(existing + new_rows)
-        logging.info("Queued %d new releases", len(new_rows))
+        log.info("Queued %d new releases", len(new_rows))
     else:
         write_queue(existing)
-        logging.info("No new items found; queue refreshed")
+        log.info("No new items found; queue refreshed")
 
 if __name__ == "__main__":
     main()
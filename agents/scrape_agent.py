@@ -6,41 +6,73 @@ Markets Policy Partners – Pipeline · Scrape-Agent.
 from __future__ import annotations
 
 import argparse
-import csv
+import email.utils
+import os
 import re
 import sys
+import threading
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+try:
+    from agents._http import make_session
+except ImportError:                       # run directly as a script
+    from _http import make_session
 
 ROOT = Path(__file__).resolve().parent.parent
 RAW_DIR = ROOT / "data" / "raw"
 QUEUE_CSV = ROOT / "data" / "rss_queue.csv"
 
+# pooled keep-alive session shared by the fetch threads – the queue hits
+# the same few hosts (BLS, Eurostat, StatsCan) over and over
+SESSION = make_session()
+
 SAFE_RE = re.compile(r"[^A-Za-z0-9._-]")
 DATE_RE = re.compile(r"(\d{6,8})")
 
+# discriminate the published formats up front – one cheap regex match
+# instead of raising through up to three failed strptime attempts per row
+ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+DMY_DASH_RE = re.compile(r"^\d{2}-\d{2}-\d{4}$")
+YMD_SLASH_RE = re.compile(r"^\d{4}/\d{2}/\d{2}$")
+DMY_SLASH_RE = re.compile(r"^\d{2}/\d{2}/\d{4}$")
+
+TODAY = datetime.utcnow().strftime("%Y%m%d")
+
+# raw-file dispatch on the lowercased suffix, computed once per row
+LOCAL_SUFFIXES = {".html", ".htm"}
+SKIP_SUFFIXES = {".pdf"}
 
+
+@lru_cache(maxsize=8192)
 def safe_filename(txt: str) -> str:
+    # the queue repeats the same release_id/url strings across rows and
+    # lookups, so memoizing skips the regex on every repeat
     return SAFE_RE.sub("_", txt)
 
 
 def best_stamp(row: dict) -> str:
     pub = (row.get("published") or row.get("pub_date") or "").strip()
     if pub:
-        for parser in (
-            lambda s: datetime.fromisoformat(s.rstrip("Z")),
-            lambda s: datetime.strptime(s, "%d-%m-%Y"),
-            lambda s: datetime.strptime(s, "%Y/%m/%d"),
-            lambda s: datetime.strptime(s, "%d/%m/%Y"),
-        ):
-            try:
-                return parser(pub).strftime("%Y%m%d")
-            except Exception:
-                continue
+        try:
+            if ISO_RE.match(pub):
+                return datetime.fromisoformat(pub.rstrip("Z")).strftime("%Y%m%d")
+            if DMY_DASH_RE.match(pub):
+                return datetime.strptime(pub, "%d-%m-%Y").strftime("%Y%m%d")
+            if YMD_SLASH_RE.match(pub):
+                return datetime.strptime(pub, "%Y/%m/%d").strftime("%Y%m%d")
+            if DMY_SLASH_RE.match(pub):
+                return datetime.strptime(pub, "%d/%m/%Y").strftime("%Y%m%d")
+        except ValueError:
+            pass
 
     for field in (row.get("release_id", ""), row.get("url", "")):
         m = DATE_RE.search(field)
@@ -54,7 +86,7 @@ def best_stamp(row: dict) -> str:
             yy = ("20" if int(yy) < 80 else "19") + yy
             return f"{yy}{mo}{dy}"
 
-    return datetime.utcnow().strftime("%Y%m%d")
+    return TODAY
 
 
 def derive_indicator(row: dict) -> str:
@@ -70,7 +102,119 @@ def derive_indicator(row: dict) -> str:
     return rid[0] or "UNKNOWN"
 
 
+def best_stamp_column(df: pd.DataFrame) -> pd.Series:
+    """Vectorized best_stamp over a whole DataFrame.
+
+    pd.to_datetime handles the ISO-shaped published values in one C pass;
+    everything else (day-first feeds, odd formats, digit-only ids) drops
+    to the scalar helper, which knows the per-format field order.
+    """
+    def col(name: str) -> pd.Series:
+        if name in df.columns:
+            return df[name].fillna("").astype(str).str.strip()
+        return pd.Series("", index=df.index)
+
+    pub = col("published")
+    pub = pub.where(pub != "", col("pub_date")).str.rstrip("Z")
+    # utc=True: mixed naive/offset ISO strings otherwise raise even
+    # under errors="coerce" (feeds store RFC3339 offsets, crawler rows
+    # are date-only)
+    ts = pd.to_datetime(pub.where(pub.str.match(ISO_RE)),
+                        errors="coerce", format="ISO8601", utc=True)
+    stamps = ts.dt.strftime("%Y%m%d")
+    rest = stamps.isna()
+    if rest.any():
+        stamps.loc[rest] = [best_stamp(r) for r in df.loc[rest].to_dict("records")]
+    return stamps
+
+
+def derive_indicator_column(df: pd.DataFrame) -> pd.Series:
+    """Vectorized derive_indicator over a whole DataFrame.
+
+    The two common cases (explicit indicator, source+dataset) run as C
+    string ops; only the release_id fallback rows drop to the Python
+    helper.
+    """
+    def col(name: str) -> pd.Series:
+        if name in df.columns:
+            return df[name].fillna("").astype(str).str.strip()
+        return pd.Series("", index=df.index)
+
+    ind, src, dts = col("indicator"), col("source"), col("dataset")
+    out = pd.Series(
+        np.where(ind != "", ind,
+                 np.where((src != "") & (dts != ""), src + "_" + dts, "")),
+        index=df.index,
+    )
+    rest = out == ""
+    if rest.any():
+        out.loc[rest] = [derive_indicator(r) for r in df.loc[rest].to_dict("records")]
+    return out
+
+
+BLANKLINES_RE = re.compile(r"\n{3,}")
+
+# one parser instance per thread (lxml parsers are not thread-safe and
+# html_to_text runs on the fetch pool), with the features we never read
+# (comments, id collection) switched off; the lxml.html parser yields
+# HtmlElement nodes, which carry text_content()
+_PARSER_LOCAL = threading.local()
+
+
+def _html_parser() -> lxml_html.HTMLParser:
+    parser = getattr(_PARSER_LOCAL, "parser", None)
+    if parser is None:
+        parser = lxml_html.HTMLParser(remove_comments=True, collect_ids=False,
+                                      recover=True)
+        _PARSER_LOCAL.parser = parser
+    return parser
+
+
+def _table_to_text(table) -> str:
+    rows = []
+    for tr in table.iter("tr"):
+        cells = [" ".join(c.text_content().split()) for c in tr.iter("th", "td")]
+        rows.append("\t".join(cells))
+    return "\n".join(rows) + "\n"
+
+
 def html_to_text(html: str) -> str:
+    # lxml keeps the whole strip/walk in C; bs4 stays as the fallback for
+    # markup lxml refuses to parse
+    try:
+        # bytes input skips lxml's encoding-detection path
+        doc = etree.fromstring(html.encode("utf-8"), parser=_html_parser())
+        if doc is None:
+            raise ValueError("unparseable document")
+    except Exception:
+        return _html_to_text_bs4(html)
+
+    etree.strip_elements(doc, "script", "style", "noscript",
+                         "header", "footer", "nav", with_tail=False)
+    for table in list(doc.iter("table")):
+        parent = table.getparent()
+        if parent is None:        # nested table already folded into its parent
+            continue
+        txt = _table_to_text(table) + (table.tail or "")
+        prev = table.getprevious()
+        if prev is not None:
+            prev.tail = (prev.tail or "") + txt
+        else:
+            parent.text = (parent.text or "") + txt
+        parent.remove(table)
+
+    text = "\n".join(chunk.strip() for chunk in doc.itertext() if chunk.strip())
+    # the join emits no blank lines itself; only multi-line text nodes can
+    # still carry runs, so gate the regex behind a C-level substring scan
+    if "\n\n\n" in text:
+        text = BLANKLINES_RE.sub("\n\n", text)
+    return text.strip()
+
+
+def _html_to_text_bs4(html: str) -> str:
+    # fallback only – don't pay the bs4 import on the common lxml path
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "lxml")
     for tag in soup(["script", "style", "noscript", "header", "footer", "nav"]):
         tag.decompose()
@@ -81,11 +225,28 @@ def html_to_text(html: str) -> str:
             rows.append("\t".join(cells))
         table.replace_with("\n".join(rows) + "\n")
     text = soup.get_text("\n", strip=True)
-    return re.sub(r"\n{3,}", "\n\n", text).strip()
-
-
-def scrape_from_url(url: str) -> str:
-    r = requests.get(url, timeout=30)
+    return BLANKLINES_RE.sub("\n\n", text).strip()
+
+
+def write_out(path: Path, text: str) -> None:
+    # encode once and land the file with open/write/close – skips the
+    # TextIOWrapper layering of Path.write_text for the many small outputs
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, text.encode("utf-8", errors="replace"))
+    finally:
+        os.close(fd)
+
+
+def scrape_from_url(url: str, mtime: float | None = None) -> str | None:
+    headers = {}
+    if mtime is not None:
+        # previous output's mtime → conditional GET; a 304 means nothing
+        # to re-parse
+        headers["If-Modified-Since"] = email.utils.formatdate(mtime, usegmt=True)
+    r = SESSION.get(url, timeout=30, headers=headers)
+    if r.status_code == 304:
+        return None
     r.raise_for_status()
     return html_to_text(r.text)
 
@@ -94,15 +255,28 @@ def scrape_from_file(path: Path) -> str:
     return html_to_text(path.read_text(encoding="utf-8", errors="ignore"))
 
 
-def lookup_raw(row: dict) -> Path | None:
-    patterns = [
-        safe_filename(row.get("release_id", "")) + "*",
-        safe_filename(row.get("url", "")) + "*",
-    ]
-    for pat in patterns:
-        matches = list(RAW_DIR.glob(pat))
-        if matches:
-            return matches[0]
+def build_raw_index() -> tuple[dict[str, Path], list[str]]:
+    """Snapshot RAW_DIR once: stem → path plus sorted stems for prefix probes."""
+    if not RAW_DIR.exists():
+        return {}, []
+    index: dict[str, Path] = {}
+    for p in RAW_DIR.iterdir():
+        index.setdefault(p.stem, p)
+    return index, sorted(index)
+
+
+def lookup_raw(row: dict, raw_index: tuple[dict[str, Path], list[str]]) -> Path | None:
+    index, stems = raw_index
+    for key in (safe_filename(row.get("release_id", "")),
+                safe_filename(row.get("url", ""))):
+        if not key:
+            continue
+        hit = index.get(key)
+        if hit:
+            return hit
+        i = bisect_left(stems, key)
+        if i < len(stems) and stems[i].startswith(key):
+            return index[stems[i]]
     return None
 
 
@@ -115,14 +289,23 @@ def parse_args() -> argparse.Namespace:
 
 def load_records(excel: str | None) -> list[dict]:
     if excel:
-        df = pd.read_excel(excel)
+        # calamine reads .xlsx in Rust instead of openpyxl's Python loops
+        df = pd.read_excel(excel, engine="calamine")
         if "url" not in df.columns:
             raise SystemExit("--excel file must contain at least a 'url' column.")
+        if "dataset" in df.columns:
+            df = df[~df["dataset"].fillna("").str.startswith("EARN_")]
         return df.to_dict("records")
     if not QUEUE_CSV.exists():
         raise SystemExit("rss_queue.csv not found and no --excel given.")
-    with QUEUE_CSV.open(encoding="utf-8", newline="") as f:
-        records = [r for r in csv.DictReader(f) if r.get("status") == "DOWNLOADED"]
+    # C-engine parse + vectorized status filter, as in the other agents
+    df = pd.read_csv(QUEUE_CSV, dtype=str, keep_default_na=False)
+    mask = df["status"] == "DOWNLOADED"
+    if "dataset" in df.columns:
+        # earnings rows never get scraped – drop them here instead of
+        # re-checking every row in the run loop
+        mask &= ~df["dataset"].str.startswith("EARN_")
+    records = df[mask].to_dict("records")
     if not records:
         raise SystemExit("No DOWNLOADED rows in rss_queue.csv – run download_agent first.")
     return records
@@ -133,40 +316,85 @@ def run(excel: str | None, output_dir: str) -> None:
     out_root.mkdir(parents=True, exist_ok=True)
     records = load_records(excel)
 
-    latest: dict[str, dict] = {}
-    for r in records:
-        ind = derive_indicator(r)
-        if ind not in latest:
-            latest[ind] = r
+    # first-seen row per indicator, derived vectorized and deduped in C
+    df = pd.DataFrame(records)
+    inds = derive_indicator_column(df)
+    keep = inds.drop_duplicates(keep="first")
+    latest: dict[str, dict] = {ind: records[i] for i, ind in keep.items()}
+    stamps = dict(zip(keep, best_stamp_column(df.loc[keep.index])))
+
+    # split the work: raw HTML on disk is parsed across cores, rows
+    # needing a network fetch are dispatched to a thread pool so the loop
+    # waits on max(RTT) instead of sum(RTT)
+    fetches: list[tuple[str, str, Path, float | None]] = []
+    locals_: list[tuple[str, Path, Path]] = []
+    raw_index = build_raw_index()
 
     for ind, row in latest.items():
-        if row.get("dataset", "").startswith("EARN_"):
-            continue
         url = (row.get("url") or "").strip()
-        stamp = best_stamp(row)
+        stamp = stamps[ind]
 
         out_dir = out_root / ind
         out_dir.mkdir(parents=True, exist_ok=True)
         out_file = out_dir / f"{ind}_{stamp}.txt"
 
-        raw_path = lookup_raw(row)
+        raw_path = lookup_raw(row, raw_index)
+        suffix = raw_path.suffix.lower() if raw_path else None
+        if suffix in SKIP_SUFFIXES:
+            sys.stderr.write(f"[WARN]  {ind}: PDF found ({raw_path.name}) – skipped\n")
+            continue
+        out_mtime = out_file.stat().st_mtime if out_file.exists() else None
+        if suffix in LOCAL_SUFFIXES:
+            if out_mtime is not None and out_mtime >= raw_path.stat().st_mtime:
+                continue          # raw file unchanged since the last scrape
+            locals_.append((ind, out_file, raw_path))
+            continue
+        if not url:
+            sys.stderr.write(f"[WARN]  {ind}: no URL & no raw file – skipping\n")
+            continue
+        fetches.append((ind, url, out_file, out_mtime))
+
+    if len(locals_) == 1:
+        # one document doesn't justify spawning workers
+        ind, out_file, raw_path = locals_[0]
         try:
-            if raw_path and raw_path.suffix.lower().endswith(".html"):
-                text = scrape_from_file(raw_path)
-            elif raw_path and raw_path.suffix.lower().endswith(".pdf"):
-                sys.stderr.write(f"[WARN]  {ind}: PDF found ({raw_path.name}) – skipped\n")
-                continue
-            else:
-                if not url:
-                    sys.stderr.write(f"[WARN]  {ind}: no URL & no raw file – skipping\n")
-                    continue
-                text = scrape_from_url(url)
+            text = scrape_from_file(raw_path)
         except Exception as e:
             sys.stderr.write(f"[WARN]  {ind}: scrape failed → {e}\n")
-            continue
-
-        out_file.write_text(text, encoding="utf-8")
-        print(f"[OK]   {ind}  {out_file}")
+        else:
+            write_out(out_file, text)
+            print(f"[OK]   {ind}  {out_file}")
+    elif locals_:
+        # html_to_text is CPU-bound; processes sidestep the GIL and scale
+        # the parse step with the core count
+        bodies = [p.read_text(encoding="utf-8", errors="ignore")
+                  for _, _, p in locals_]
+        with ProcessPoolExecutor() as px:
+            futs = [px.submit(html_to_text, body) for body in bodies]
+            for (ind, out_file, _), fut in zip(locals_, futs):
+                try:
+                    text = fut.result()
+                except Exception as e:
+                    sys.stderr.write(f"[WARN]  {ind}: scrape failed → {e}\n")
+                    continue
+                write_out(out_file, text)
+                print(f"[OK]   {ind}  {out_file}")
+
+    if fetches:
+        with ThreadPoolExecutor(max_workers=min(16, len(fetches))) as ex:
+            futures = {ex.submit(scrape_from_url, url, mtime): (ind, out_file)
+                       for ind, url, out_file, mtime in fetches}
+            for fut in as_completed(futures):
+                ind, out_file = futures[fut]
+                try:
+                    text = fut.result()
+                except Exception as e:
+                    sys.stderr.write(f"[WARN]  {ind}: scrape failed → {e}\n")
+                    continue
+                if text is None:  # 304 – server copy unchanged
+                    continue
+                write_out(out_file, text)
+                print(f"[OK]   {ind}  {out_file}")
 
     print("Scrape-agent complete.")
 
@@ -2,6 +2,11 @@
 store_agent.py
 Merges parsed_rows.csv into data/macro.csv (master table) and
 deduplicates on (release_id, series).
+
+The common run appends only the new rows: a sidecar key file
+(macro_keys.txt) tracks every (release_id, series) already stored, so
+the full read-concat-rewrite of macro.csv happens only when an incoming
+row replaces an existing key.
 """
 
 import pandas as pd, datetime as dt, logging
@@ -10,28 +15,67 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 PARSED_CSV = ROOT / "data" / "parsed_rows.csv"
 MACRO_CSV  = ROOT / "data" / "macro.csv"
+KEYS_TXT   = ROOT / "data" / "macro_keys.txt"
 LOG_DIR    = ROOT / "logs"; LOG_DIR.mkdir(exist_ok=True)
-logging.basicConfig(filename=LOG_DIR / f"store_{dt.date.today()}.log",
-                    level=logging.INFO,
-                    format="%(asctime)s %(levelname)s %(message)s")
+# own named logger (not basicConfig on root) so this agent's records
+# stay in its own file when several agents run in one process
+_handler = logging.FileHandler(LOG_DIR / f"store_{dt.date.today()}.log")
+_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+log = logging.getLogger(__name__)
+log.addHandler(_handler)
+log.setLevel(logging.INFO)
+log.propagate = False
+
+def _key_series(df: pd.DataFrame) -> pd.Series:
+    return df["release_id"].astype(str) + "\t" + df["series"].astype(str)
+
+def load_keys() -> set[str]:
+    if KEYS_TXT.exists():
+        return set(KEYS_TXT.read_text(encoding="utf-8").splitlines())
+    if MACRO_CSV.exists():          # rebuild the sidecar from the master
+        return set(_key_series(pd.read_csv(MACRO_CSV)))
+    return set()
+
+def save_keys(keys: set[str]) -> None:
+    KEYS_TXT.write_text("\n".join(sorted(keys)), encoding="utf-8")
 
 def main():
     if not PARSED_CSV.exists():
-        logging.info("No parsed rows yet.")
+        log.info("No parsed rows yet.")
         return
 
     df_new = pd.read_csv(PARSED_CSV)
     df_new["ingest_ts"] = dt.datetime.utcnow().isoformat(timespec='seconds')
 
     if MACRO_CSV.exists():
+        keys = load_keys()
+        if not set(_key_series(df_new)) & keys:
+            # pure append – no key collision, so no rewrite of the master;
+            # align to the master's header so a headerless append cannot
+            # shift values into the wrong columns
+            header = pd.read_csv(MACRO_CSV, nrows=0).columns
+            df_new.reindex(columns=header).to_csv(
+                MACRO_CSV, mode="a", header=False, index=False)
+            keys |= set(_key_series(df_new))
+            save_keys(keys)
+            log.info("Appended %d rows to macro.csv", len(df_new))
+            PARSED_CSV.unlink()
+            return
         df_old = pd.read_csv(MACRO_CSV)
         df = pd.concat([df_old, df_new], ignore_index=True)
-        df = df.drop_duplicates(subset=["release_id", "series"], keep="last")
+        # tail(1) keeps whole rows (groupby.last would mix columns from
+        # different rows when the newer one has NaNs) and preserves the
+        # master's column order; ingest_ts is ISO so the stable string
+        # sort keeps "newest wins" semantics
+        df = (df.sort_values("ingest_ts", kind="stable")
+                .groupby(["release_id", "series"], sort=False)
+                .tail(1))
     else:
         df = df_new
 
     df.to_csv(MACRO_CSV, index=False)
-    logging.info("macro.csv now has %d rows", len(df))
+    save_keys(set(_key_series(df)))
+    log.info("macro.csv now has %d rows", len(df))
 
     # clear parsed file
     PARSED_CSV.unlink()
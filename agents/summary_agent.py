@@ -6,8 +6,10 @@ Adds Nasdaq corporate-earnings workflow (EARN_PRE / EARN_AH)
 """
 
 from __future__ import annotations
-import glob, os, pathlib, re, json, base64               # ← base64 added
-from datetime import datetime, timedelta
+import io, os, pathlib, pickle, re, json, base64         # ← base64 added
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 import streamlit as st
 from dotenv import load_dotenv
@@ -16,6 +18,7 @@ import pandas as pd
 import requests                                         # ← Constant-Contact API
 import subprocess
 import sys
+import time
 from pathlib import Path
 
 # ── PAGE CONFIG ────────────────────────────────────────────────────────────
@@ -42,17 +45,38 @@ st.title("Flash-Brief Dashboard")
 if st.sidebar.button("Update Releases"):
     with st.spinner("Updating all releases…"):
         script_dir = Path(__file__).resolve().parent
+        # earnings_agent reads rss_queue.csv and data/raw, so it starts
+        # once download has finished and runs alongside scrape; the
+        # chain itself stays sequential because each stage reads the
+        # previous one's output
+        earn_proc = None
+        failed = False
         for script in [
             "rss_agent.py",
             "download_agent.py",
             "scrape_agent.py",
-            "earnings_agent.py",
         ]:
-            subprocess.run(
+            if script == "scrape_agent.py":
+                earn_proc = subprocess.Popen(
+                    [sys.executable, str(script_dir / "earnings_agent.py")],
+                )
+            rc = subprocess.run(
                 [sys.executable, str(script_dir / script)],
-                check=True,
-            )
-    st.sidebar.success("✅ Releases pipeline complete!")
+            ).returncode
+            if rc:
+                st.sidebar.error(f"{script} exited with code {rc}")
+                failed = True
+                break
+        if earn_proc is not None and earn_proc.wait():
+            st.sidebar.error("earnings_agent.py failed")
+            failed = True
+    if not failed:
+        # build_latest_path/rel_date are defined further down; flag the
+        # update here and drop their caches just before they are used,
+        # otherwise the dashboard serves the pre-update scan for up to
+        # five minutes
+        st.session_state.releases_updated = True
+        st.sidebar.success("✅ Releases pipeline complete!")
 
 # ── ENV / OPENAI ───────────────────────────────────────────────────────────
 load_dotenv()
@@ -60,7 +84,17 @@ OPENAI_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_KEY:
     st.error("🚫 OPENAI_API_KEY missing.")
     st.stop()
-client = OpenAI(api_key=OPENAI_KEY)
+# cache_resource keeps one warmed client per server – reruns reuse its
+# internal connection pool instead of rebuilding it
+@st.cache_resource
+def _openai() -> OpenAI:
+    # max_retries covers transient 429/5xx with the SDK's exponential
+    # backoff (it honours Retry-After), so one rate-limit blip no longer
+    # kills the whole dashboard build; the card thread pool's worker
+    # count bounds how many requests are in flight at once
+    return OpenAI(api_key=OPENAI_KEY, max_retries=5)
+
+client = _openai()
 
 # ── CONSTANTS & HELPERS ────────────────────────────────────────────────────
 ROOT        = pathlib.Path(__file__).resolve().parent.parent
@@ -77,14 +111,19 @@ REGION_MAP = {
 
 NY_TZ = ZoneInfo("America/New_York")
 
-if CONFIG_XLSX.exists():
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_display_map() -> dict[str, str]:
+    # the Excel parse costs 100s of ms – don't repeat it on every rerun
+    if not CONFIG_XLSX.exists():
+        return {}
     cfg_df = pd.read_excel(CONFIG_XLSX, dtype=str)
-    DISPLAY_MAP = dict(zip(cfg_df["dataset"],
-                           cfg_df.get("display_name", cfg_df["dataset"])))
-else:
-    DISPLAY_MAP = {}
+    return dict(zip(cfg_df["dataset"],
+                    cfg_df.get("display_name", cfg_df["dataset"])))
+
+DISPLAY_MAP = load_display_map()
 
-DATE_RE = re.compile(r"_(\d{6,8})")        # match 6 or 8 digits anywhere
+DATE_RE = re.compile(r"_(\d{6,8})\.txt$")  # stamp sits just before the extension
+_TICKER_FALLBACK_RE = re.compile(r"-([a-z]{1,5})(?:-|$)", re.I)
 DATE_WINDOWS = {
     "Last 24 hours": timedelta(days=1),
     "Last 7 days":   timedelta(days=7),
@@ -103,55 +142,120 @@ CC_FROM_EMAIL = os.getenv("CC_FROM_EMAIL", "")
 CC_REPLY_TO_EMAIL = os.getenv("CC_REPLY_TO_EMAIL", "")
 
 # ── Nasdaq ticker→company mapping ────────────────────────────────────────────
+NASDAQ_PKL = ROOT / "data" / "nasdaq_names.pkl"
+
+@st.cache_data(ttl=60 * 60 * 24, show_spinner=False, persist="disk")
 def load_nasdaq_names() -> dict[str, str]:
+    # two-level cache: st.cache_data per process, plus a pickle under
+    # data/ (mtime < 24 h) that survives restarts and cache clears –
+    # the ~1 MB symbol file shouldn't be re-downloaded on every deploy
+    try:
+        if NASDAQ_PKL.stat().st_mtime > time.time() - 86400:
+            with NASDAQ_PKL.open("rb") as fh:
+                return pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
     url = "https://www.nasdaqtrader.com/dynamic/symdir/nasdaqlisted.txt"
     try:
-        r = requests.get(url, timeout=10)
-        lines = r.text.splitlines()
-        mapping: dict[str, str] = {}
-        for row in lines[1:]:
-            if row.startswith("File"):       # footer line
-                continue
-            cols = row.split("|")
-            if len(cols) < 2:
-                continue
-            mapping[cols[0]] = cols[1]
-        return mapping
-    except requests.exceptions.RequestException:
+        r = _HTTP_SESSION.get(url, timeout=10)
+        # declarative parse: skipfooter drops the "File Creation Time"
+        # trailer instead of the manual per-line checks
+        df = pd.read_csv(io.StringIO(r.text), sep="|", dtype=str,
+                         keep_default_na=False, skipfooter=1, engine="python")
+        mapping = dict(zip(df["Symbol"], df["Security Name"]))
+    except (requests.exceptions.RequestException, KeyError,
+            pd.errors.ParserError):
         return {}
 
-TICKER_NAME_MAP = load_nasdaq_names()
+    try:
+        NASDAQ_PKL.parent.mkdir(parents=True, exist_ok=True)
+        with NASDAQ_PKL.open("wb") as fh:
+            pickle.dump(mapping, fh, protocol=5)
+    except OSError:
+        pass
+    return mapping
+
+# one keep-alive session for every outbound call (CC API, token refresh,
+# Nasdaq symbol file) – reusing the TCP/TLS connection saves ~2 RTTs per call
+@st.cache_resource
+def _http_session() -> requests.Session:
+    return requests.Session()
+
+_HTTP_SESSION = _http_session()
 
 # ── auto-refresh helper ----------------------------------------------------
+def _cc_refresh() -> bool:
+    """Swap REFRESH_TOKEN → new access-/refresh-token pair."""
+    basic = base64.b64encode(f"{CC_CLIENT_ID}:{CC_CLIENT_SECRET}".encode()).decode()
+    r = _HTTP_SESSION.post(
+        "https://authz.constantcontact.com/oauth2/default/v1/token",
+        headers={
+            "Authorization": f"Basic {basic}",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Accept": "application/json",
+        },
+        data=f"grant_type=refresh_token&refresh_token={CC_REFRESH_TOKEN}",
+        timeout=10,
+    )
+    if r.status_code == 200 and r.json().get("access_token"):
+        globals()["CC_ACCESS_TOKEN"]  = r.json()["access_token"]
+        globals()["CC_REFRESH_TOKEN"] = r.json()["refresh_token"]
+        # remember when this token lapses so the next call can refresh
+        # up front instead of eating a 401 round-trip
+        expires_in = int(r.json().get("expires_in", 0))
+        if expires_in:
+            st.session_state.cc_token_expiry = time.time() + expires_in - 60
+        return True
+    return False
+
 def cc_request(method: str, url: str, **kwargs) -> requests.Response:
     """
     Make one Constant-Contact API call.
-    • On 401, swap REFRESH_TOKEN → new access-/refresh-token pair and retry once.
+    • Refreshes the access token ~60 s before its known expiry.
+    • On 401 (unknown expiry / clock skew), refreshes and retries once.
+    • Backs off and retries once each on 429/5xx.
     """
-    hdrs = kwargs.pop("headers", {})
-    hdrs["Authorization"] = f"Bearer {CC_ACCESS_TOKEN}"
-    resp = requests.request(method, url, headers=hdrs, timeout=10, **kwargs)
-
-    if resp.status_code == 401 and CC_REFRESH_TOKEN:
-        basic = base64.b64encode(f"{CC_CLIENT_ID}:{CC_CLIENT_SECRET}".encode()).decode()
-        r = requests.post(
-            "https://authz.constantcontact.com/oauth2/default/v1/token",
-            headers={
-                "Authorization": f"Basic {basic}",
-                "Content-Type": "application/x-www-form-urlencoded",
-                "Accept": "application/json",
-            },
-            data=f"grant_type=refresh_token&refresh_token={CC_REFRESH_TOKEN}",
-            timeout=10,
-        )
-        if r.status_code == 200 and r.json().get("access_token"):
-            globals()["CC_ACCESS_TOKEN"]  = r.json()["access_token"]
-            globals()["CC_REFRESH_TOKEN"] = r.json()["refresh_token"]
-            hdrs["Authorization"] = f"Bearer {CC_ACCESS_TOKEN}"
-            resp = requests.request(method, url, headers=hdrs, timeout=10, **kwargs)
+    if CC_REFRESH_TOKEN and time.time() >= st.session_state.get(
+            "cc_token_expiry", float("inf")):
+        _cc_refresh()
 
+    hdrs = kwargs.pop("headers", {})
+    refreshed = False
+    for attempt in range(3):
+        hdrs["Authorization"] = f"Bearer {CC_ACCESS_TOKEN}"
+        resp = _HTTP_SESSION.request(method, url, headers=hdrs, timeout=10, **kwargs)
+        if resp.status_code == 401 and CC_REFRESH_TOKEN and not refreshed:
+            refreshed = True
+            if _cc_refresh():
+                continue
+            return resp
+        if resp.status_code in (429, 500, 502, 503, 504) and attempt < 2:
+            time.sleep(2 ** attempt)
+            continue
+        return resp
     return resp
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _get_confirmed_emails() -> frozenset[str]:
+    """CONFIRMED sender addresses – one CC call per hour per server."""
+    v_resp = cc_request("GET", "https://api.cc.email/v3/account/emails")
+    if v_resp.status_code != 200:
+        raise RuntimeError(
+            f"Could not fetch verified emails — status {v_resp.status_code}")
+    resp_data = v_resp.json()
+    if isinstance(resp_data, dict):
+        email_list = resp_data.get("email_addresses", [])
+    elif isinstance(resp_data, list):
+        email_list = resp_data
+    else:
+        email_list = []
+    return frozenset(
+        item.get("email_address")
+        for item in email_list
+        if item.get("confirm_status") == "CONFIRMED"
+    )
+
 def scheduled_dt(tag: str, file_dt: datetime) -> datetime:
     """
     Return the *scheduled* earnings-preview time in New-York tz.
@@ -161,33 +265,68 @@ def scheduled_dt(tag: str, file_dt: datetime) -> datetime:
     hour = 9 if tag == "EARN_PRE" else 17
     return datetime(file_dt.year, file_dt.month, file_dt.day, hour, 0, tzinfo=NY_TZ)
 
-def rel_date(path: pathlib.Path) -> datetime:
-    """
-    Return a datetime for sorting.
-    • If name has _YYYYMMDD or _DDMMYY, parse it.
-    • Otherwise use file-mod-time (UTC).
-    """
-    m = DATE_RE.search(path.name)
+def _parse_stamp(name: str) -> datetime | None:
+    """Parse the _YYYYMMDD / _DDMMYY stamp out of a file name, if any."""
+    m = DATE_RE.search(name)
     if not m:
-        return datetime.utcfromtimestamp(path.stat().st_mtime)
-
+        return None
     digits = m.group(1)
+    # int slicing instead of strptime – the format-string parse is the
+    # expensive part and these two layouts are fixed
     try:
         if len(digits) == 8:               # 20240618
-            return datetime.strptime(digits, "%Y%m%d")
+            return datetime(int(digits[:4]), int(digits[4:6]), int(digits[6:8]),
+                            tzinfo=timezone.utc)
         elif len(digits) == 6:             # 250522 -> 2022-05-25
-            return datetime.strptime(digits, "%d%m%y")
+            yy = int(digits[4:6])
+            year = 2000 + yy if yy < 69 else 1900 + yy   # %y pivot
+            return datetime(year, int(digits[2:4]), int(digits[:2]),
+                            tzinfo=timezone.utc)
     except ValueError:
         pass
+    return None
 
-    return datetime.utcfromtimestamp(path.stat().st_mtime)
+@lru_cache(maxsize=4096)
+def rel_date(path: pathlib.Path) -> datetime:
+    """
+    Return a datetime for sorting.
+    • If name has _YYYYMMDD or _DDMMYY, parse it.
+    • Otherwise use file-mod-time (UTC).
 
+    Memoized: the sidebar and render paths call this several times per
+    file per rerun, each hit otherwise costing a regex and maybe a stat.
+    """
+    return _parse_stamp(path.name) or datetime.fromtimestamp(
+        path.stat().st_mtime, tz=timezone.utc)
+
+@lru_cache(maxsize=512)
 def split_dir(dir_name: str) -> tuple[str, str, str]:
     src, code = dir_name.split("_", 1)
     region  = REGION_MAP.get(src, src)
     pretty  = DISPLAY_MAP.get(code, code)
     return region, code, pretty
 
+OPENAI_MODEL = "o4-mini-2025-04-16"
+
+# per-prompt caps on release text; the file read honours them too so
+# oversized releases never fully enter memory. Kept separate because
+# they size the billed prompt (and its cache key) for each card type.
+EARN_RAW_CAP = 150_000
+MACRO_RAW_CAP = 120_000
+
+@st.cache_data(ttl=24 * 3600, show_spinner=False, persist="disk")
+def _call_llm(model: str, prompt: str) -> str:
+    """One completion, cached on (model, prompt).
+
+    Identical inputs (same release text, same tickers) come straight
+    from the cache instead of repeating a multi-second, billed API call.
+    """
+    res = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return res.choices[0].message.content.strip()
+
 # ── ★ earnings-specific prompt --------------------------------------------
 def earnings_prompt(tag: str, tickers: list[str], raw: str) -> tuple[str, str]:
     when   = "Tomorrow’s pre-market earnings" if tag == "EARN_PRE" else "Tonight’s after-hours earnings"
@@ -205,7 +344,7 @@ def earnings_prompt(tag: str, tickers: list[str], raw: str) -> tuple[str, str]:
 
     Source article (trimmed)
     ------------------------
-    {raw[:150_000]}
+    {raw}
 
     Write *exactly* the following:
 
@@ -225,11 +364,7 @@ def earnings_prompt(tag: str, tickers: list[str], raw: str) -> tuple[str, str]:
     No bullets, no sources.
     """
 
-    res = client.chat.completions.create(
-        model="o4-mini-2025-04-16",
-        messages=[{"role": "user", "content": prompt}],
-    )
-    lines = res.choices[0].message.content.strip().splitlines()
+    lines = _call_llm(OPENAI_MODEL, prompt).splitlines()
     return (lines[0] if lines else "No headline.",
             "\n".join(lines[2:]).strip())
 
@@ -238,7 +373,7 @@ def read_saved_tickers(txt_path: pathlib.Path) -> list[str]:
     side = txt_path.with_suffix(".tickers")
     if side.exists():
         return [t.strip().upper() for t in side.read_text().split(",") if t.strip()]
-    m = re.findall(r"-([a-z]{1,5})(?:-|$)", txt_path.stem, flags=re.I)
+    m = _TICKER_FALLBACK_RE.findall(txt_path.stem)
     return [s.upper() for s in m]
 
 # ── macro prompt  (unchanged) ----------------------------------------------
@@ -247,7 +382,7 @@ def gpt_summary(ind_name: str, raw: str) -> tuple[str, str]:
         "You are a macroeconomic analyst.\n\n"
         f"Indicator: {ind_name}\n\n"
         "Here is the raw press-release content (incl tables):\n"
-        "----\n" + raw[:120_000] + "\n----\n\n"
+        "----\n" + raw + "\n----\n\n"
         "Return only:\n"
         "• First line: ≤10-word Oped style headline.\n"
         "• Blank line.\n"
@@ -261,26 +396,48 @@ def gpt_summary(ind_name: str, raw: str) -> tuple[str, str]:
         "**If a statistic (YoY, MoM, etc.) is not included in the text below, "
         "say nothing about it—do not state that it was ‘not released’.**\n\n"
     )
-    res = client.chat.completions.create(
-        model="o4-mini-2025-04-16",
-        messages=[{"role": "user", "content": prompt}],
-    )
-    lines = res.choices[0].message.content.strip().splitlines()
+    lines = _call_llm(OPENAI_MODEL, prompt).splitlines()
     return (lines[0] if lines else "No headline.",
             " ".join(l.strip() for l in lines[2:] if l.strip()))
 
 # ── BUILD LATEST PATH PER INDICATOR ────────────────────────────────────────
-paths = [pathlib.Path(p) for p in glob.glob(f"{DATA_ROOT}/*/*.txt")]
-if not paths:
+@st.cache_data(ttl=300, show_spinner=False)
+def build_latest_path() -> dict[str, str]:
+    """Newest .txt per release directory, cached for five minutes.
+
+    One scandir walk keeps the per-directory max in a single pass;
+    DirEntry.stat() is cached per entry and only consulted for names
+    without a parseable date stamp. Paths are returned as strings so
+    the result pickles cleanly for the cache.
+    """
+    latest: dict[str, str] = {}
+    if not DATA_ROOT.exists():
+        return latest
+    for sub in os.scandir(DATA_ROOT):
+        if not sub.is_dir():
+            continue
+        best_p, best_dt = None, None
+        for f in os.scandir(sub.path):
+            if not f.name.endswith(".txt"):
+                continue
+            dt_ = _parse_stamp(f.name) or datetime.fromtimestamp(
+                f.stat().st_mtime, tz=timezone.utc)
+            if best_dt is None or dt_ > best_dt:
+                best_p, best_dt = f.path, dt_
+        if best_p is not None:
+            latest[sub.name] = best_p
+    return latest
+
+if st.session_state.pop("releases_updated", False):
+    build_latest_path.clear()
+    rel_date.cache_clear()
+
+latest_path = {d: pathlib.Path(s) for d, s in build_latest_path().items()}
+
+if not latest_path:
     st.warning("No .txt files in ./releases — run scrape_agent first.")
     st.stop()
 
-latest_path: dict[str, pathlib.Path] = {}
-for p in paths:
-    d = p.parent.name
-    if (d not in latest_path) or (rel_date(p) > rel_date(latest_path[d])):
-        latest_path[d] = p
-
 # ── newest earnings + ticker lists -----------------------------------------
 def _latest(tag: str) -> tuple[pathlib.Path | None, list[str]]:
     cands = [p for d,p in latest_path.items() if d.endswith(tag)]
@@ -306,134 +463,157 @@ _init("sel_pm", [])
 _init("sel_ah", [])
 
 # ── SIDEBAR FILTERS (region / indicator + earnings box) --------------------
-with st.sidebar:
-    st.header("Filters")
-
-    regions = sorted({split_dir(d)[0] for d in latest_path})
-    sel_regions = st.multiselect("Region / Country", regions, [])
+@st.fragment
+def _sidebar() -> None:
+    """Sidebar filters, isolated from the card pipeline.
 
-    ind_opts = []
-    for d in latest_path:
-        reg, code, pretty = split_dir(d)
-        if code.startswith("EARN"):
-            continue
-        if not sel_regions or reg in sel_regions:
-            ind_opts.append(f"{reg} – {pretty}")
-    sel_inds = st.multiselect("Indicator", sorted(ind_opts), [])
-
-    with st.expander("Corporate Earnings (Nasdaq)", expanded=False):
-        # ── Include / exclude the two earnings decks
-        st.session_state.incl_pm = st.checkbox(
-            "Include Pre-Market (next day)",
-            value=st.session_state.incl_pm and bool(pm_path),
-        )
-        st.session_state.incl_ah = st.checkbox(
-            "Include After-Hours (today)",
-            value=st.session_state.incl_ah and bool(ah_path),
-        )
+    Widget clicks rerun only this fragment; the main body reads the
+    results from session_state and re-executes only on the app-scoped
+    reruns issued by Apply Filters and Go.
+    """
+    with st.sidebar:
+        st.header("Filters")
+        TICKER_NAME_MAP = load_nasdaq_names()   # cache hit on warm reruns
 
-        # ── Checkbox picker – Pre-Market tickers
-        if st.session_state.incl_pm and pm_path:
-            st.markdown("**Pre-Market tickers**")
-            picked_pm: list[str] = []
-            for tk in sorted(pm_tickers):
-                name = TICKER_NAME_MAP.get(tk, "")
-                label = f"{tk} – {name}" if name else tk
-                if st.checkbox(label, key=f"pm_{tk}", value=tk in st.session_state.sel_pm):
-                    picked_pm.append(tk)
-            st.session_state.sel_pm = picked_pm  # update session state
-
-        # ── Checkbox picker – After-Hours tickers
-        if st.session_state.incl_ah and ah_path:
-            st.markdown("**After-Hours tickers**")
-            picked_ah: list[str] = []
-            for tk in sorted(ah_tickers):
-                name = TICKER_NAME_MAP.get(tk, "")
-                label = f"{tk} – {name}" if name else tk
-                if st.checkbox(label, key=f"ah_{tk}", value=tk in st.session_state.sel_ah):
-                    picked_ah.append(tk)
-            st.session_state.sel_ah = picked_ah
-
-    date_choice  = st.selectbox("Show releases from…", list(DATE_WINDOWS), index=1)
-    newest_first = st.checkbox("Newest first", value=True)
-
-    # Apply
-    if st.button("Apply Filters"):
-        # ── 0️⃣ Guard-rail ────────────────────────────────────────────
-        # If the user hasn’t picked *anything* (no region, no indicator,
-        # and both earnings sections disabled) we return an empty result.
-        if (
-                not sel_regions
-                and not sel_inds
-                and not st.session_state.incl_pm
-                and not st.session_state.incl_ah
-        ):
-            st.session_state.filtered_files = []
-            st.session_state.filters_applied = True
-            st.session_state.go_clicked = False
-            st.info("Please select at least one region/indicator or earnings deck.")
-            st.stop()
+        # split every directory name once, reused by the region list,
+        # indicator options and the filter loop below
+        dir_meta = [(p,) + split_dir(d) for d, p in latest_path.items()]
 
-        # ── 1️⃣ Build filtered list – other filters first ────────────
-        filtered: list[pathlib.Path] = []
-        delta = DATE_WINDOWS[date_choice]
+        regions = sorted({reg for _, reg, _, _ in dir_meta})
+        sel_regions = st.multiselect("Region / Country", regions, [])
+        sel_regions_set = set(sel_regions)
 
-        for d, p in latest_path.items():
-            reg, code, pretty = split_dir(d)
+        ind_opts = []
+        for _, reg, code, pretty in dir_meta:
+            if code.startswith("EARN"):
+                continue
+            if not sel_regions_set or reg in sel_regions_set:
+                ind_opts.append(f"{reg} – {pretty}")
+        sel_inds = st.multiselect("Indicator", sorted(ind_opts), [])
+        sel_inds_set = set(sel_inds)
+
+        with st.expander("Corporate Earnings (Nasdaq)", expanded=False):
+            # ── Include / exclude the two earnings decks
+            st.session_state.incl_pm = st.checkbox(
+                "Include Pre-Market (next day)",
+                value=st.session_state.incl_pm and bool(pm_path),
+            )
+            st.session_state.incl_ah = st.checkbox(
+                "Include After-Hours (today)",
+                value=st.session_state.incl_ah and bool(ah_path),
+            )
 
-            # ---- MACRO INDICATORS -----------------------------------
-            if not code.startswith("EARN"):
-                # a. Region filter (if any)
-                if sel_regions and reg not in sel_regions:
-                    continue
-                # b. Indicator filter (if any)
-                if sel_inds and f"{reg} – {pretty}" not in sel_inds:
-                    continue
-                # c. If BOTH region & indicator lists are empty,
-                #    we *skip* this macro — we don’t want the date
-                #    filter to pull in random series.
-                if not sel_regions and not sel_inds:
+            # one multiselect per deck instead of a checkbox per ticker –
+            # 2 widgets to reconcile on a rerun rather than 2·N
+            def _tick_label(tk: str) -> str:
+                name = TICKER_NAME_MAP.get(tk, "")
+                return f"{tk} – {name}" if name else tk
+
+            # ── Ticker picker – Pre-Market
+            if st.session_state.incl_pm and pm_path:
+                opts = sorted(pm_tickers)
+                st.session_state.sel_pm = st.multiselect(
+                    "Pre-Market tickers", opts,
+                    default=[t for t in st.session_state.sel_pm if t in opts],
+                    format_func=_tick_label,
+                )
+
+            # ── Ticker picker – After-Hours
+            if st.session_state.incl_ah and ah_path:
+                opts = sorted(ah_tickers)
+                st.session_state.sel_ah = st.multiselect(
+                    "After-Hours tickers", opts,
+                    default=[t for t in st.session_state.sel_ah if t in opts],
+                    format_func=_tick_label,
+                )
+
+        date_choice  = st.selectbox("Show releases from…", list(DATE_WINDOWS), index=1)
+        newest_first = st.checkbox("Newest first", value=True)
+
+        if st.button("Clear summary cache"):
+            _call_llm.clear()
+
+        # Apply
+        if st.button("Apply Filters"):
+            # ── 0️⃣ Guard-rail ────────────────────────────────────────────
+            # If the user hasn’t picked *anything* (no region, no indicator,
+            # and both earnings sections disabled) we return an empty result.
+            if (
+                    not sel_regions
+                    and not sel_inds
+                    and not st.session_state.incl_pm
+                    and not st.session_state.incl_ah
+            ):
+                st.session_state.filtered_files = []
+                st.session_state.filters_applied = True
+                st.session_state.go_clicked = False
+                st.info("Please select at least one region/indicator or earnings deck.")
+                st.stop()
+
+            # ── 1️⃣ Build filtered list – other filters first ────────────
+            filtered: list[pathlib.Path] = []
+            delta = DATE_WINDOWS[date_choice]
+            now = datetime.now(timezone.utc)   # one clock read for the whole filter
+
+            for p, reg, code, pretty in dir_meta:
+
+                # ---- MACRO INDICATORS -----------------------------------
+                if not code.startswith("EARN"):
+                    # a. Region filter (if any)
+                    if sel_regions_set and reg not in sel_regions_set:
+                        continue
+                    # b. Indicator filter (if any)
+                    if sel_inds_set and f"{reg} – {pretty}" not in sel_inds_set:
+                        continue
+                    # c. If BOTH region & indicator lists are empty,
+                    #    we *skip* this macro — we don’t want the date
+                    #    filter to pull in random series.
+                    if not sel_regions_set and not sel_inds_set:
+                        continue
+
+                # ---- EARNINGS DECKS ------------------------------------
+                else:
+                    if code == "EARN_PRE" and not st.session_state.incl_pm:
+                        continue
+                    if code == "EARN_AH" and not st.session_state.incl_ah:
+                        continue
+                    # If the corresponding ticker list is now empty,
+                    # skip the card entirely.
+                    if code == "EARN_PRE" and not st.session_state.sel_pm:
+                        continue
+                    if code == "EARN_AH" and not st.session_state.sel_ah:
+                        continue
+
+                # ---- 2️⃣ Date-window filter (applied last) --------------
+                if delta and (now - rel_date(p) > delta):
                     continue
 
-            # ---- EARNINGS DECKS ------------------------------------
-            else:
-                if code == "EARN_PRE" and not st.session_state.incl_pm:
-                    continue
-                if code == "EARN_AH" and not st.session_state.incl_ah:
-                    continue
-                # If the corresponding ticker list is now empty,
-                # skip the card entirely.
-                if code == "EARN_PRE" and not st.session_state.sel_pm:
-                    continue
-                if code == "EARN_AH" and not st.session_state.sel_ah:
-                    continue
+                filtered.append(p)
 
-            # ---- 2️⃣ Date-window filter (applied last) --------------
-            if delta and (datetime.utcnow() - rel_date(p) > delta):
-                continue
+            # ---- 3️⃣ Sort & stash in session state ----------------------
+            filtered.sort(key=rel_date, reverse=newest_first)
+            st.session_state.filtered_files = filtered
+            st.session_state.filters_applied = True
+            st.session_state.go_clicked = False
+            st.rerun(scope="app")   # clear any cards from a previous Go
+
+        # Matches
+        if st.session_state.filters_applied:
+            if st.session_state.filtered_files:
+                st.markdown("---")
+                st.markdown("**Matching releases:**")
+                for p in st.session_state.filtered_files:
+                    r, code, pr = split_dir(p.parent.name)
+                    label = (f"Nasdaq – {'Pre-Mkt' if code=='EARN_PRE' else 'After-Hrs'} Earnings"
+                             if code.startswith("EARN") else f"{r} – {pr}")
+                    st.markdown(f"- {label} ({rel_date(p).strftime('%Y-%m-%d')})")
+                if st.button("Go"):
+                    st.session_state.go_clicked = True
+                    st.rerun(scope="app")   # card pipeline runs app-wide
+            else:
+                st.info("No releases match the selection.")
 
-            filtered.append(p)
-
-        # ---- 3️⃣ Sort & stash in session state ----------------------
-        filtered.sort(key=rel_date, reverse=newest_first)
-        st.session_state.filtered_files = filtered
-        st.session_state.filters_applied = True
-        st.session_state.go_clicked = False
-
-    # Matches
-    if st.session_state.filters_applied:
-        if st.session_state.filtered_files:
-            st.markdown("---")
-            st.markdown("**Matching releases:**")
-            for p in st.session_state.filtered_files:
-                r, code, pr = split_dir(p.parent.name)
-                label = (f"Nasdaq – {'Pre-Mkt' if code=='EARN_PRE' else 'After-Hrs'} Earnings"
-                         if code.startswith("EARN") else f"{r} – {pr}")
-                st.markdown(f"- {label} ({rel_date(p).strftime('%Y-%m-%d')})")
-            if st.button("Go"):
-                st.session_state.go_clicked = True
-        else:
-            st.info("No releases match the selection.")
+_sidebar()
 
 # ── STOP if not ready ──────────────────────────────────────────────────────
 if not (st.session_state.filters_applied and st.session_state.go_clicked):
@@ -444,22 +624,47 @@ if not st.session_state.filtered_files:
 
 # ── GENERATE & DISPLAY CARDS ───────────────────────────────────────────────
 email_blocks: list[str] = []
+plain_blocks: list[str] = []     # text twin of each card – no HTML stripping later
 
+# Phase 1 – collect the work: one (file, tickers, raw) task per card
+tasks: list[tuple[str, str, str, list[str] | None, str]] = []
 for p in st.session_state.filtered_files:
     region, code, pretty = split_dir(p.parent.name)
-    raw = p.read_text(encoding="utf-8", errors="ignore")
+    cap = EARN_RAW_CAP if code in ("EARN_PRE", "EARN_AH") else MACRO_RAW_CAP
+    with p.open("rb") as fh:                  # read only what the prompt can use
+        # 2× headroom so multi-byte text still decodes to cap chars;
+        # the char cap is applied here once, so the prompt builders can
+        # embed the text without re-slicing a fresh 150 KB string each
+        raw = fh.read(cap * 2).decode("utf-8", "ignore")[:cap]
 
-    # ── Earnings cards ────────────────────────────────────────────────────
     if code in ("EARN_PRE", "EARN_AH"):
-        tag     = code
-        tickers = (st.session_state.sel_pm if tag=="EARN_PRE"
+        tickers = (st.session_state.sel_pm if code=="EARN_PRE"
                    else st.session_state.sel_ah)
         if not tickers:
             continue
+        tasks.append((code, region, pretty, sorted(tickers), raw))
+    else:
+        tasks.append((code, region, pretty, None, raw))
+
+# Phase 2 – fire the OpenAI calls together: they are independent and
+# network-bound, so the wait is max(latency) instead of the sum. The
+# shared client is thread-safe; Streamlit writes stay on the main thread.
+with ThreadPoolExecutor(max_workers=8) as ex:
+    futures = [
+        ex.submit(earnings_prompt, code, tickers, raw) if tickers is not None
+        else ex.submit(gpt_summary, f"{region} – {pretty}", raw)
+        for code, region, pretty, tickers, raw in tasks
+    ]
+    results = [f.result() for f in futures]
+
+# Phase 3 – render the cards sequentially in filter order
+for (code, region, pretty, tickers, raw), (head, brief) in zip(tasks, results):
 
-        head, brief = earnings_prompt(tag, sorted(tickers), raw)
+    # ── Earnings cards ────────────────────────────────────────────────────
+    if code in ("EARN_PRE", "EARN_AH"):
+        tag = code
         title = f"Nasdaq – {'Pre-Market' if tag=='EARN_PRE' else 'After-Hours'} Earnings"
-        tick_line = ", ".join(sorted(tickers))
+        tick_line = ", ".join(tickers)
 
         # ---- wrap each ticker paragraph for email-friendly spacing --------------
         paras = [p.strip() for p in brief.split("\n\n") if p.strip()]
@@ -478,15 +683,14 @@ for p in st.session_state.filtered_files:
 
     # ── Macro cards ───────────────────────────────────────────────────────
     else:
-        ind_name = f"{region} – {pretty}"
-        head, brief = gpt_summary(ind_name, raw)
-        title = ind_name
+        title = f"{region} – {pretty}"
         body  = f"<h3>{head}</h3><p>{brief}</p>"
 
     # ---- Display & e-mail collect
     st.markdown(f"#### {title}")
     st.markdown(f"<div class='mpp-card'>{body}</div>", unsafe_allow_html=True)
     email_blocks.append(f"<h2>{title}</h2>{body}")
+    plain_blocks.append(f"{title}\n\n{head}\n\n{brief}")
 
 st.success("Dashboard built ✔")
 
@@ -535,39 +739,20 @@ if st.button("Send to Subscribers"):
         st.error(f"Email body too large ({size_bytes} bytes). Trim content.")
         st.stop()
 
-    # 2️⃣ Verify that our 'from' address is confirmed in CC (once per session)
-    if "cc_from_confirmed" not in st.session_state:
-        v_url = "https://api.cc.email/v3/account/emails"
-        try:
-            v_resp = cc_request("GET", v_url)  # ← CHANGED ↓
-        except requests.exceptions.RequestException as e:
-            st.error(f"Network error fetching verified emails: {e}")
-            st.stop()
-
-        if v_resp.status_code != 200:
-            st.error(f"Could not fetch verified emails — status {v_resp.status_code}")
-            st.json(v_resp.json())
-            st.stop()
-
-        resp_data = v_resp.json()
-        if isinstance(resp_data, dict):
-            email_list = resp_data.get("email_addresses", [])
-        elif isinstance(resp_data, list):
-            email_list = resp_data
-        else:
-            email_list = []
-
-        confirmed_emails = {
-            item.get("email_address")
-            for item in email_list
-            if item.get("confirm_status") == "CONFIRMED"
-        }
-
-        if CC_FROM_EMAIL not in confirmed_emails:
-            st.error("Your from-email is not verified (CONFIRMED) in Constant Contact.")
-            st.stop()
-
-        st.session_state.cc_from_confirmed = True
+    # 2️⃣ Verify that our 'from' address is confirmed in CC (cached 1 h,
+    #    shared across sessions instead of once per session)
+    try:
+        confirmed_emails = _get_confirmed_emails()
+    except requests.exceptions.RequestException as e:
+        st.error(f"Network error fetching verified emails: {e}")
+        st.stop()
+    except RuntimeError as e:
+        st.error(str(e))
+        st.stop()
+
+    if CC_FROM_EMAIL not in confirmed_emails:
+        st.error("Your from-email is not verified (CONFIRMED) in Constant Contact.")
+        st.stop()
 
     # 3️⃣ Build the exact payload *matching the docs*
     now_str = datetime.now(NY_TZ).strftime("%m/%d/%y (%I:%M %p)").lower()  # eg. 06/15/25 (12:05 pm)
@@ -584,9 +769,7 @@ if st.button("Send to Subscribers"):
                 "html_content": email_body,                           # full HTML
                 "plain_content": (
                     "Markets Policy Partners Flash-Brief\n\n"
-                    + "\n\n".join(
-                        re.sub(r"<[^>]+>", "", block) for block in email_blocks
-                    )
+                    + "\n\n".join(plain_blocks)
                 ),
                 "contact_list_ids": [CC_LIST_ID],                     # subscriber list
                 # physical_address_in_footer is *optional*—we omit it.
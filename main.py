@@ -3,26 +3,86 @@
 from __future__ import annotations
 
 import argparse
+import importlib
 import subprocess
 import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
 AGENTS = ROOT / "agents"
 
-STAGE_TO_SCRIPT = {
-    "rss": AGENTS / "rss_agent.py",
-    "download": AGENTS / "download_agent.py",
-    "scrape": AGENTS / "scrape_agent.py",
-    "earnings": AGENTS / "earnings_agent.py",
-    "summary": AGENTS / "summary_agent.py",
-    "store": AGENTS / "store_agent.py",
-    "fred": AGENTS / "fred_calendar_agent.py",
+# stages run in-process so pandas/requests/lxml import once for a full
+# pipeline run instead of once per interpreter
+STAGE_TO_MAIN = {
+    "rss": "agents.rss_agent:main",
+    "download": "agents.download_agent:main",
+    "scrape": "agents.scrape_agent:main",
+    "earnings": "agents.earnings_agent:main",
+    "store": "agents.store_agent:main",
+    "fred": "agents.fred_calendar_agent:main",
 }
 
+# stage → stages that must finish first; fred has no dependencies and
+# can start immediately. earnings reads rss_queue.csv and data/raw, so
+# it waits for download (cheap – scrape dominates the critical path).
+STAGE_DEPS = {
+    "rss": [],
+    "download": ["rss"],
+    "scrape": ["download"],
+    "earnings": ["download"],
+    "store": ["scrape", "earnings"],
+    "fred": [],
+}
+
+# the summary dashboard is a Streamlit script, not a callable stage
+SUMMARY_SCRIPT = AGENTS / "summary_agent.py"
+
+
+def _call_stage(stage: str) -> None:
+    mod_name, fn_name = STAGE_TO_MAIN[stage].split(":")
+    getattr(importlib.import_module(mod_name), fn_name)()
+
+
+def run_stage(stage: str) -> None:
+    if stage == "summary":
+        subprocess.run([sys.executable, str(SUMMARY_SCRIPT)], check=True)
+        return
+    argv = sys.argv
+    sys.argv = [stage]          # stages that parse args see their defaults
+    try:
+        _call_stage(stage)
+    finally:
+        sys.argv = argv
+
+
+def run_all() -> None:
+    """Run every stage, overlapping the independent branches.
 
-def run_script(path: Path) -> None:
-    subprocess.run([sys.executable, str(path)], check=True)
+    Stages are scheduled as their dependencies complete, so the wall
+    clock tracks the rss → download → scrape → store critical path while
+    fred runs alongside it and earnings overlaps scrape.
+    """
+    argv = sys.argv
+    sys.argv = ["main.py"]      # one mask for all threads
+    try:
+        pending = set(STAGE_DEPS)
+        done: set[str] = set()
+        running: dict = {}
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            while pending or running:
+                ready = [s for s in pending
+                         if all(d in done for d in STAGE_DEPS[s])]
+                for s in ready:
+                    pending.discard(s)
+                    running[ex.submit(_call_stage, s)] = s
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    stage = running.pop(fut)
+                    fut.result()        # re-raise stage failures
+                    done.add(stage)
+    finally:
+        sys.argv = argv
 
 
 def main() -> None:
@@ -32,7 +92,7 @@ def main() -> None:
     run_parser = sub.add_parser("run", help="Run one stage or all stages")
     run_parser.add_argument(
         "stage",
-        choices=[*STAGE_TO_SCRIPT.keys(), "all"],
+        choices=[*STAGE_TO_MAIN.keys(), "summary", "all"],
         help="Stage to run",
     )
 
@@ -40,10 +100,9 @@ def main() -> None:
 
     if args.cmd == "run":
         if args.stage == "all":
-            for stage in ("rss", "download", "scrape", "earnings", "store", "fred"):
-                run_script(STAGE_TO_SCRIPT[stage])
+            run_all()
             return
-        run_script(STAGE_TO_SCRIPT[args.stage])
+        run_stage(args.stage)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,35 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+# session scope: each agent module (and its pandas/requests imports)
+# loads once per pytest run and is shared by every test that needs it
+
+@pytest.fixture(scope="session")
+def rss_agent():
+    import agents.rss_agent
+    return agents.rss_agent
+
+
+@pytest.fixture(scope="session")
+def download_agent():
+    import agents.download_agent
+    return agents.download_agent
+
+
+@pytest.fixture(scope="session")
+def scrape_agent():
+    import agents.scrape_agent
+    return agents.scrape_agent
+
+
+@pytest.fixture(scope="session")
+def earnings_agent():
+    import agents.earnings_agent
+    return agents.earnings_agent
@@ -1,10 +1,16 @@
-from agents.download_agent import file_extension, safe_filename
+import pytest
 
 
-def test_safe_filename_replaces_special_chars():
-    assert safe_filename("a/b:c") == "a_b_c"
+def test_safe_filename_replaces_special_chars(download_agent):
+    assert download_agent.safe_filename("a/b:c") == "a_b_c"
 
 
-def test_file_extension_detects_pdf():
-    assert file_extension("https://example.com/a.pdf") == ".pdf"
-    assert file_extension("https://example.com/a") == ".html"
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://example.com/a.pdf", ".pdf"),
+        ("https://example.com/a", ".html"),
+    ],
+)
+def test_file_extension(download_agent, url, expected):
+    assert download_agent.file_extension(url) == expected
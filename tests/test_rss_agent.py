@@ -1,9 +1,12 @@
-from agents.rss_agent import sort_key
-
-
-def test_sort_key_iso_date():
-    assert sort_key({"published": "2025-06-19"}) == "20250619"
-
-
-def test_sort_key_dd_mm_yyyy():
-    assert sort_key({"published": "19-06-2025"}) == "20250619"
+import pytest
+
+
+@pytest.mark.parametrize(
+    "pub,expected",
+    [
+        ("2025-06-19", "20250619"),   # ISO
+        ("19-06-2025", "20250619"),   # DD-MM-YYYY
+    ],
+)
+def test_sort_key(rss_agent, pub, expected):
+    assert rss_agent.sort_key({"published": pub}) == expected
@@ -1,11 +1,29 @@
-from agents.scrape_agent import best_stamp, derive_indicator
-
-
-def test_best_stamp_prefers_published_iso():
+def test_best_stamp_prefers_published_iso(scrape_agent):
     row = {"published": "2025-06-20", "release_id": "foo_010120"}
-    assert best_stamp(row) == "20250620"
+    assert scrape_agent.best_stamp(row) == "20250620"
 
 
-def test_derive_indicator_from_source_dataset():
+def test_derive_indicator_from_source_dataset(scrape_agent):
     row = {"source": "BLS", "dataset": "CPI"}
-    assert derive_indicator(row) == "BLS_CPI"
+    assert scrape_agent.derive_indicator(row) == "BLS_CPI"
+
+
+def test_best_stamp_column_mixed_naive_and_aware(scrape_agent):
+    import pandas as pd
+    df = pd.DataFrame({
+        "published": ["2025-06-20", "2025-06-19T12:00:00+00:00", ""],
+        "release_id": ["a_010120", "b_010120", "c_20250618"],
+    })
+    assert list(scrape_agent.best_stamp_column(df)) == [
+        "20250620", "20250619", "20250618"]
+
+
+def test_html_to_text_folds_tables(scrape_agent):
+    html = ("<html><body><p>intro</p>"
+            "<table><tr><th>Item</th><th>Value</th></tr>"
+            "<tr><td>CPI</td><td>3.1</td></tr></table>"
+            "<p>outro</p></body></html>")
+    text = scrape_agent.html_to_text(html)
+    assert "Item\tValue" in text
+    assert "CPI\t3.1" in text
+    assert "intro" in text and "outro" in text